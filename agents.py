@@ -1,4 +1,5 @@
 from crewai import Agent
+from tracing import is_quiet
 
 def build_parser_agent():
     """
@@ -12,7 +13,7 @@ def build_parser_agent():
         goal="Extract clean, structured text from a resume.",
         backstory="You are an expert at cleaning resume text and removing formatting artifacts.",
         allow_delegation=False,
-        verbose=True
+        verbose=not is_quiet()
     )
 
 def build_ats_writer_agent():
@@ -27,7 +28,7 @@ def build_ats_writer_agent():
         goal="Create a high-scoring ATS-optimized resume.",
         backstory="You are an expert in ATS formats and keyword optimization for applicant tracking systems.",
         allow_delegation=False,
-        verbose=True
+        verbose=not is_quiet()
     )
 
 def build_evaluator_agent():
@@ -42,7 +43,7 @@ def build_evaluator_agent():
         goal="Provide accurate ATS scores and actionable recommendations.",
         backstory="A precise ATS scoring expert with deep knowledge of applicant tracking systems.",
         allow_delegation=False,
-        verbose=True
+        verbose=not is_quiet()
     )
 
 def build_refiner_agent():
@@ -57,5 +58,5 @@ def build_refiner_agent():
         goal="Transform bullet points into high-impact statements.",
         backstory="Expert in creating powerful, quantified bullet points that showcase achievements and drive results.",
         allow_delegation=False,
-        verbose=True
+        verbose=not is_quiet()
     )
\ No newline at end of file
@@ -2,9 +2,15 @@
 import config
 
 import os
+import uuid
 import streamlit as st
+from dedup import NearDuplicateIndex, match_key, minhash_signature
+from scheduler import PipelineScheduler, SchedulerRejected, user_key
 from file_tools.file_loader import detect_and_extract
-from crew import run_pipeline
+from file_tools.docx_writer import docx_bytes
+from crew import is_complete_result, run_pipeline
+
+DOCX_MIME = "application/vnd.openxmlformats-officedocument.wordprocessingml.document"
 
 # Configure Streamlit page
 st.set_page_config(
@@ -14,6 +20,41 @@ st.set_page_config(
     initial_sidebar_state="expanded"
 )
 
+@st.cache_resource
+def get_duplicate_index():
+    """Process-wide index of recent runs, shared across all user sessions."""
+    return NearDuplicateIndex()
+
+@st.cache_resource
+def get_scheduler():
+    """Process-wide admission control for pipeline runs (see ATS_MAX_* env vars)."""
+    return PipelineScheduler.from_env()
+
+def get_user_identity():
+    """
+    Identifies the user for per-user concurrency limits, the same across all of their tabs.
+
+    See `scheduler.user_key`: the logged-in account if Streamlit authentication is configured,
+    else the client address. Without either it falls back to the browser session.
+    """
+    account = None
+    user = getattr(st, "user", None)
+    try:
+        if user is not None and user.get("is_logged_in"):
+            account = user.get("email")
+    except Exception:
+        pass  # Authentication is not configured
+    
+    context = getattr(st, "context", None)  # Streamlit >= 1.37
+    headers = context.headers if context is not None else {}
+    identity = user_key(account, getattr(context, "ip_address", None), headers.get("X-Forwarded-For"))
+    if identity:
+        return identity
+    
+    if "session_user_id" not in st.session_state:
+        st.session_state.session_user_id = uuid.uuid4().hex
+    return f"session:{st.session_state.session_user_id}"
+
 # Main title
 st.title("🧠 ATS-Optimized Resume Agent")
 st.caption("Powered by CrewAI, Groq & LangSmith")
@@ -35,6 +76,13 @@ with st.sidebar:
         help="Select the Groq model to use for processing your resume"
     )
     
+    reuse_near_duplicates = st.checkbox(
+        "Reuse results for near-identical resumes",
+        value=False,
+        help="If a nearly identical resume with the same name and contact details was recently "
+             "optimized for the same job and model, show that result instead of running the pipeline again"
+    )
+    
     st.divider()
     
     # Connection status display
@@ -49,7 +97,11 @@ with st.sidebar:
     if config_status['tracing_enabled']:
         st.write(f"**LangSmith Key:** {'✅ Set' if config_status['langsmith_key_set'] else '❌ Missing'}")
         st.write(f"**Project:** `{config_status['langsmith_project']}`")
+        st.write(f"**Trace Sampling:** {config_status['trace_sample_rate']:.0%} of runs")
         st.info("🔍 Traces will be available in your LangSmith project")
+    elif config_status['trace_sink'] == "file":
+        st.write(f"**Trace Sampling:** {config_status['trace_sample_rate']:.0%} of runs")
+        st.info("📝 Traces are written to a local file (ATS_TRACE_SINK=file)")
     else:
         st.warning("⚠️ LangSmith tracing is disabled. Set LANGCHAIN_API_KEY to enable.")
     
@@ -142,13 +194,58 @@ if run_button:
             "📊 ATS Evaluation"
         ])
         
-        # Run the pipeline with a spinner
-        with st.spinner(f"🤖 Processing your resume with `{selected_model}`... This may take 2-3 minutes."):
-            cleaned, rewritten, final_resume, evaluation = run_pipeline(
-                raw_resume_text=raw_resume_text,
-                job_title=job_title.strip(),
-                job_description=job_description.strip()
+        # Look for a near-identical resume from the same person, recently run for the same job and model.
+        # A match is served only if the user opted in to reuse; otherwise it is just flagged.
+        duplicate_index = get_duplicate_index()
+        run_key = match_key(job_title.strip(), job_description.strip(), selected_model, raw_resume_text)
+        signature = minhash_signature(raw_resume_text)
+        match = duplicate_index.find_signature(signature, run_key)
+        
+        if match and reuse_near_duplicates:
+            st.info(
+                f"♻️ This resume is {match.similarity:.0%} similar to one recently optimized for the same job "
+                f"and model, so the previous result is shown. Untick \"Reuse results for near-identical "
+                f"resumes\" in the sidebar to force a fresh run."
             )
+            cleaned, rewritten, final_resume, evaluation = match.result
+        else:
+            if match:
+                st.info(
+                    f"♻️ This resume is {match.similarity:.0%} similar to one recently optimized for the same "
+                    f"job and model. Tick \"Reuse results for near-identical resumes\" in the sidebar to "
+                    f"show that result instead of waiting for a new run."
+                )
+            
+            queue_message = st.empty()
+            
+            def show_queue_status(status):
+                queue_message.info(
+                    f"⏳ Waiting for a free slot: position {status.position} in the queue, "
+                    f"expected wait about {status.expected_wait_s / 60:.0f} min."
+                )
+            
+            try:
+                # All UI requests share the default priority; ordering comes from the lanes and per-user fairness
+                with get_scheduler().slot(get_user_identity(), selected_model, on_update=show_queue_status):
+                    queue_message.empty()
+                    # Run the pipeline with a spinner
+                    with st.spinner(f"🤖 Processing your resume with `{selected_model}`... This may take 2-3 minutes."):
+                        cleaned, rewritten, final_resume, evaluation = run_pipeline(
+                            raw_resume_text=raw_resume_text,
+                            job_title=job_title.strip(),
+                            job_description=job_description.strip()
+                        )
+            except SchedulerRejected as e:
+                queue_message.empty()
+                st.error(
+                    f"🚦 {e.reason} {e.queue_length} request(s) are already waiting; "
+                    f"please try again in about {e.expected_wait_s / 60:.0f} min."
+                )
+                st.stop()
+            # Only fully successful runs are worth serving again
+            result = (cleaned, rewritten, final_resume, evaluation)
+            if is_complete_result(result):
+                duplicate_index.add(uuid.uuid4().hex, raw_resume_text, run_key, result, signature=signature)
         
         # Display results in tabs
         with tab1:
@@ -161,6 +258,12 @@ if run_button:
                 file_name="cleaned_resume.txt",
                 mime="text/plain"
             )
+            st.download_button(
+                "📥 Download Cleaned Resume (DOCX)",
+                docx_bytes(cleaned),
+                file_name="cleaned_resume.docx",
+                mime=DOCX_MIME
+            )
         
         with tab2:
             st.subheader("ATS-Optimized Version")
@@ -172,6 +275,12 @@ if run_button:
                 file_name="ats_optimized_resume.txt",
                 mime="text/plain"
             )
+            st.download_button(
+                "📥 Download ATS Version (DOCX)",
+                docx_bytes(rewritten),
+                file_name="ats_optimized_resume.docx",
+                mime=DOCX_MIME
+            )
         
         with tab3:
             st.subheader("Final Refined Resume")
@@ -183,6 +292,12 @@ if run_button:
                 file_name="final_resume.txt",
                 mime="text/plain"
             )
+            st.download_button(
+                "📥 Download Final Resume (DOCX)",
+                docx_bytes(final_resume),
+                file_name="final_resume.docx",
+                mime=DOCX_MIME
+            )
         
         with tab4:
             st.subheader("ATS Evaluation & Recommendations")
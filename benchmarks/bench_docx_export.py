@@ -0,0 +1,91 @@
+"""
+Benchmark: DOCX export throughput.
+
+Compares the python-docx based `utils.txt_to_docx_bytes` helper with the
+streaming `file_tools.docx_writer` path, both per document and as a batch
+job across a process pool.
+
+Usage:
+    python benchmarks/bench_docx_export.py --docs 2000 --workers 4
+"""
+import argparse
+import os
+import sys
+import tempfile
+import time
+from io import BytesIO
+
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+
+from file_tools.docx_writer import export_batch, write_docx
+from utils import txt_to_docx_bytes
+
+SAMPLE_RESUME = """JANE DOE
+Senior Data Engineer | jane@example.com | +1 555 0100
+
+SUMMARY
+Data engineer with 8 years of experience building reliable batch and streaming pipelines.
+
+WORK EXPERIENCE
+Acme Corp - Senior Data Engineer (2019 - Present)
+- Reduced nightly ETL runtime by 45% by migrating 120 jobs from Hive to Spark
+- Led a team of 4 engineers delivering a real-time fraud pipeline processing 2M events/day
+- Cut AWS spend by $180K/year through storage tiering and right-sizing EMR clusters
+Globex - Data Engineer (2016 - 2019)
+- Built CI/CD for 60+ Airflow DAGs, lowering failed deploys by 70%
+- Designed dimensional models powering 35 executive dashboards
+
+SKILLS
+- Python, SQL, Spark, Airflow, Kafka, AWS, Docker, Kubernetes
+
+EDUCATION
+B.Sc. Computer Science, State University
+"""
+
+
+def _time(label, fn, count):
+    start = time.perf_counter()
+    fn()
+    elapsed = time.perf_counter() - start
+    print(f"{label:<42} {elapsed:8.3f}s  {count / elapsed:10.1f} docs/s")
+    return elapsed
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--docs", type=int, default=1000, help="Number of documents to export")
+    parser.add_argument("--workers", type=int, default=os.cpu_count(), help="Process pool size for batch export")
+    parser.add_argument("--repeat", type=int, default=1, help="Repeat the sample resume N times per document")
+    args = parser.parse_args()
+
+    text = SAMPLE_RESUME * args.repeat
+    print(f"{args.docs} documents, {len(text.splitlines())} lines each, {args.workers} workers\n")
+
+    with tempfile.TemporaryDirectory() as tmp:
+        baseline = _time(
+            "utils.txt_to_docx_bytes (serial)",
+            lambda: [txt_to_docx_bytes(text) for _ in range(args.docs)],
+            args.docs,
+        )
+        streamed = _time(
+            "docx_writer.write_docx -> BytesIO (serial)",
+            lambda: [write_docx(text, BytesIO()) for _ in range(args.docs)],
+            args.docs,
+        )
+        _time(
+            "docx_writer.write_docx -> files (serial)",
+            lambda: [write_docx(text, os.path.join(tmp, f"s{i}.docx")) for i in range(args.docs)],
+            args.docs,
+        )
+        batch = _time(
+            "docx_writer.export_batch -> files",
+            lambda: export_batch(((f"b{i}", text) for i in range(args.docs)), tmp, max_workers=args.workers),
+            args.docs,
+        )
+
+    print(f"\nSerial speedup vs baseline: {baseline / streamed:.1f}x")
+    print(f"Batch speedup vs baseline:  {baseline / batch:.1f}x")
+
+
+if __name__ == "__main__":
+    main()
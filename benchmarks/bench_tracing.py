@@ -0,0 +1,97 @@
+"""
+Benchmark: per-span tracing overhead on the calling thread.
+
+Compares an unsampled span, a sampled span handed to the background
+exporter, a synchronous JSONL write per span, and langsmith's @traceable
+with tracing disabled vs. enabled in local mode (run trees are built and
+serialized but not uploaded).
+
+Usage:
+    python benchmarks/bench_tracing.py --spans 20000
+"""
+import argparse
+import json
+import os
+import sys
+import tempfile
+import time
+
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+
+import tracing
+from tracing import BackgroundExporter, sampled_run, span
+
+PAYLOAD = "x" * 2000  # roughly one resume section
+
+
+def _per_call(label, fn, count):
+    start = time.perf_counter()
+    for _ in range(count):
+        fn()
+    elapsed = time.perf_counter() - start
+    print(f"{label:<48} {elapsed / count * 1e6:9.2f} µs/span")
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--spans", type=int, default=20000, help="Spans per measurement")
+    args = parser.parse_args()
+
+    with tempfile.TemporaryDirectory() as tmp:
+        os.environ["ATS_TRACE_SINK"] = "file"
+        os.environ["ATS_TRACE_FILE"] = os.path.join(tmp, "async.jsonl")
+        os.environ["ATS_TRACE_BUFFER"] = str(args.spans + 1)
+
+        def unsampled():
+            with sampled_run(False), span("stage"):
+                pass
+
+        def sampled():
+            with sampled_run(True), span("stage", payload=PAYLOAD):
+                pass
+
+        sync_path = os.path.join(tmp, "sync.jsonl")
+
+        def synchronous():
+            start = time.time()
+            with open(sync_path, "a", encoding="utf-8") as f:
+                f.write(json.dumps({"name": "stage", "start_time": start,
+                                    "duration_s": time.time() - start,
+                                    "metadata": {"payload": PAYLOAD}}) + "\n")
+
+        _per_call("span, run not sampled", unsampled, args.spans)
+        _per_call("span, sampled -> BackgroundExporter", sampled, args.spans)
+        _per_call("synchronous JSONL write per span", synchronous, args.spans)
+        exporter = tracing.get_exporter()
+        exporter.close(timeout=60)
+        print(f"  exporter: {exporter.exported} exported, {exporter.dropped} dropped")
+
+        # An exporter with a small buffer and a slow sink shows the bounded buffer at work
+        class SlowSink:
+            def write(self, records):
+                time.sleep(0.05)
+
+        bounded = BackgroundExporter(SlowSink(), max_buffer=100)
+        _per_call("submit to full buffer (slow sink, 100 slots)", lambda: bounded.submit({"p": PAYLOAD}), args.spans)
+        print(f"  bounded: {bounded.dropped} of {args.spans} dropped, caller never blocked")
+        bounded.close(timeout=10)
+
+    try:
+        from langsmith import traceable, tracing_context
+    except ImportError:
+        print("\nlangsmith not installed; skipping @traceable comparison")
+        return
+
+    @traceable(run_type="chain", name="bench")
+    def traced(text):
+        return text
+
+    count = max(args.spans // 10, 1)
+    with tracing_context(enabled=False):
+        _per_call("@traceable, tracing disabled (unsampled run)", lambda: traced(PAYLOAD), count)
+    with tracing_context(enabled="local"):
+        _per_call("@traceable, tracing enabled (local, no upload)", lambda: traced(PAYLOAD), count)
+
+
+if __name__ == "__main__":
+    main()
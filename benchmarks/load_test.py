@@ -0,0 +1,218 @@
+"""
+Load test: simulated users driving upload -> detect_and_extract -> run_pipeline.
+
+Each simulated user repeatedly "uploads" a resume (DOCX bytes), extracts its
+text with `detect_and_extract`, waits for a slot from the same
+`PipelineScheduler` the Streamlit app uses, and runs the real CrewAI pipeline
+against a local stub LLM (benchmarks/stub_llm.py). The Streamlit UI layer is
+not driven over HTTP. The harness exercises the same call path in-process,
+which is where the pipeline's CPU, threads and memory go.
+
+For each user count it reports p50/p95/p99 end-to-end latency, throughput,
+errors/rejections and RSS growth. The saturation point is the first user
+count where throughput stops improving by at least --min-gain, or p95 breaks
+the --slo target.
+
+Usage:
+    python benchmarks/load_test.py --users 1,2,4,8,16 --requests 3 --latency lognormal:0,0.5
+    python benchmarks/load_test.py --users 8 --no-scheduler --json results.json
+"""
+import argparse
+import json
+import math
+import os
+import socket
+import statistics
+import subprocess
+import sys
+import threading
+import time
+
+ROOT = os.path.abspath(os.path.join(os.path.dirname(__file__), '..'))
+sys.path.insert(0, ROOT)
+
+SAMPLE_JD = (
+    "We are hiring a Senior Data Engineer to build and maintain data pipelines. "
+    "Requirements: Python, SQL, Apache Spark, Airflow, AWS, Docker, Kubernetes and CI/CD. "
+    "You will own data pipelines end to end and mentor junior engineers."
+)
+
+
+def percentile(values, pct):
+    """Nearest-rank percentile; returns 0.0 for an empty list."""
+    if not values:
+        return 0.0
+    ordered = sorted(values)
+    index = max(0, min(len(ordered) - 1, math.ceil(pct / 100 * len(ordered)) - 1))
+    return ordered[index]
+
+
+def rss_mb() -> float:
+    """Current resident set size of this process in MB (Linux /proc, else peak RSS)."""
+    try:
+        with open("/proc/self/statm") as f:
+            return int(f.read().split()[1]) * os.sysconf("SC_PAGE_SIZE") / 2**20
+    except (OSError, ValueError):
+        import resource
+        return resource.getrusage(resource.RUSAGE_SELF).ru_maxrss / 1024
+
+
+def _free_port() -> int:
+    with socket.socket() as s:
+        s.bind(("127.0.0.1", 0))
+        return s.getsockname()[1]
+
+
+def start_stub(latency: str):
+    """Starts the stub LLM in a separate process so it does not share our GIL."""
+    port = _free_port()
+    proc = subprocess.Popen(
+        [sys.executable, os.path.join(ROOT, "benchmarks", "stub_llm.py"), "--port", str(port), "--latency", latency],
+        stdout=subprocess.DEVNULL,
+    )
+    deadline = time.monotonic() + 10
+    while time.monotonic() < deadline:
+        try:
+            socket.create_connection(("127.0.0.1", port), timeout=0.2).close()
+            return proc, f"http://127.0.0.1:{port}/v1"
+        except OSError:
+            time.sleep(0.05)
+    proc.kill()
+    raise RuntimeError("Stub LLM did not start")
+
+
+def configure(base_url: str, model: str):
+    """Points the app configuration at the stub and silences tracing/logging."""
+    os.environ.setdefault("GROQ_API_KEY", "stub-key")
+    os.environ["ATS_TRACE_SINK"] = "off"
+    os.environ["ATS_QUIET"] = "true"
+    import config
+    # setup_environment hard-codes the Groq endpoint; override it after import
+    os.environ["OPENAI_API_BASE"] = base_url
+    os.environ["OPENAI_BASE_URL"] = base_url
+    config.configure_model_for_run(model)
+
+
+def run_level(users: int, requests_per_user: int, model: str, use_scheduler: bool, resume_bytes: bytes):
+    """Runs one load level and returns its metrics."""
+    from crew import run_pipeline
+    from file_tools.file_loader import detect_and_extract
+    from scheduler import PipelineScheduler, SchedulerRejected
+
+    scheduler = PipelineScheduler.from_env() if use_scheduler else None
+    latencies, queue_waits = [], []
+    errors = rejected = 0
+    lock = threading.Lock()
+
+    def user(user_index: int):
+        nonlocal errors, rejected
+        for _ in range(requests_per_user):
+            start = time.perf_counter()
+            try:
+                _, text = detect_and_extract("resume.docx", resume_bytes)
+                if scheduler is None:
+                    run_pipeline(text, "Senior Data Engineer", SAMPLE_JD)
+                    waited = 0.0
+                else:
+                    with scheduler.slot(f"user-{user_index}", model) as ticket:
+                        waited = ticket.started_at - ticket.enqueued_at
+                        run_pipeline(text, "Senior Data Engineer", SAMPLE_JD)
+            except SchedulerRejected:
+                with lock:
+                    rejected += 1
+                continue
+            except Exception as e:
+                with lock:
+                    errors += 1
+                print(f"  user-{user_index}: {type(e).__name__}: {e}", file=sys.stderr)
+                continue
+            with lock:
+                latencies.append(time.perf_counter() - start)
+                queue_waits.append(waited)
+
+    rss_before = rss_mb()
+    wall_start = time.perf_counter()
+    threads = [threading.Thread(target=user, args=(i,), name=f"sim-user-{i}") for i in range(users)]
+    for t in threads:
+        t.start()
+    for t in threads:
+        t.join()
+    wall = time.perf_counter() - wall_start
+
+    return {
+        "users": users,
+        "completed": len(latencies),
+        "errors": errors,
+        "rejected": rejected,
+        "wall_s": round(wall, 3),
+        "throughput_rps": round(len(latencies) / wall, 4) if wall else 0.0,
+        "p50_s": round(percentile(latencies, 50), 3),
+        "p95_s": round(percentile(latencies, 95), 3),
+        "p99_s": round(percentile(latencies, 99), 3),
+        "mean_queue_wait_s": round(statistics.mean(queue_waits), 3) if queue_waits else 0.0,
+        "rss_start_mb": round(rss_before, 1),
+        "rss_growth_mb": round(rss_mb() - rss_before, 1),
+    }
+
+
+def find_saturation(results, min_gain: float, slo_p95: float):
+    """Returns the first user count past which adding users no longer helps, or None."""
+    previous = None
+    for level in results:
+        if slo_p95 and level["p95_s"] > slo_p95:
+            return level["users"]
+        if previous and level["throughput_rps"] < previous["throughput_rps"] * (1 + min_gain):
+            return level["users"]
+        previous = level
+    return None
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--users", default="1,2,4,8", help="Comma-separated concurrent user counts to sweep")
+    parser.add_argument("--requests", type=int, default=2, help="Pipeline runs per simulated user per level")
+    parser.add_argument("--latency", default="lognormal:-1,0.5", help="Stub LLM latency spec (see stub_llm.py)")
+    parser.add_argument("--model", default="llama-3.1-8b-instant", help="Model name (selects the scheduler lane)")
+    parser.add_argument("--stub-url", help="Use an already running stub/OpenAI-compatible endpoint")
+    parser.add_argument("--no-scheduler", action="store_true", help="Call run_pipeline without admission control")
+    parser.add_argument("--min-gain", type=float, default=0.1, help="Throughput gain below which a level counts as saturated")
+    parser.add_argument("--slo", type=float, default=0.0, help="p95 latency target in seconds (0 disables)")
+    parser.add_argument("--json", help="Also write the results to this JSON file")
+    args = parser.parse_args()
+
+    stub = None
+    base_url = args.stub_url
+    if not base_url:
+        stub, base_url = start_stub(args.latency)
+    try:
+        configure(base_url, args.model)
+        from file_tools.docx_writer import docx_bytes
+        from stub_llm import CANNED_RESUME
+        resume_bytes = docx_bytes(CANNED_RESUME * 3)
+
+        print(f"Stub LLM: {base_url} ({args.latency}), scheduler: {'off' if args.no_scheduler else 'on'}\n")
+        header = f"{'users':>5} {'done':>5} {'err':>4} {'rej':>4} {'rps':>8} {'p50':>7} {'p95':>7} {'p99':>7} {'queue':>7} {'rss+MB':>7}"
+        print(header)
+        print("-" * len(header))
+        results = []
+        for users in (int(u) for u in args.users.split(",")):
+            level = run_level(users, args.requests, args.model, not args.no_scheduler, resume_bytes)
+            results.append(level)
+            print(f"{level['users']:>5} {level['completed']:>5} {level['errors']:>4} {level['rejected']:>4} "
+                  f"{level['throughput_rps']:>8.3f} {level['p50_s']:>7.2f} {level['p95_s']:>7.2f} "
+                  f"{level['p99_s']:>7.2f} {level['mean_queue_wait_s']:>7.2f} {level['rss_growth_mb']:>7.1f}")
+
+        saturation = find_saturation(results, args.min_gain, args.slo)
+        print(f"\nSaturation point: {f'{saturation} users' if saturation else 'not reached'}")
+        if args.json:
+            with open(args.json, "w") as f:
+                json.dump({"latency": args.latency, "scheduler": not args.no_scheduler,
+                           "saturation_users": saturation, "levels": results}, f, indent=2)
+    finally:
+        if stub is not None:
+            stub.terminate()
+            stub.wait(5)
+
+
+if __name__ == "__main__":
+    main()
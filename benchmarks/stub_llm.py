@@ -0,0 +1,140 @@
+"""
+Stub OpenAI-compatible LLM server for load testing.
+
+Answers /v1/chat/completions (and /chat/completions) after a delay drawn
+from a configurable latency distribution, returning canned output shaped
+like each pipeline stage expects: a resume for parse/rewrite/refine, a
+bullet edit list for patch-mode refinement and a JSON score for evaluation.
+
+Latency specs:
+    constant:2          always 2 s
+    uniform:1,3         uniformly between 1 and 3 s
+    lognormal:0.5,0.6   exp(N(mu=0.5, sigma=0.6)) s, a long-tailed distribution
+
+Usage:
+    python benchmarks/stub_llm.py --port 8808 --latency lognormal:0.5,0.6
+"""
+import argparse
+import json
+import random
+import re
+import time
+import uuid
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+CANNED_RESUME = """JANE DOE
+Senior Data Engineer | jane@example.com
+
+WORK EXPERIENCE
+Acme Corp - Senior Data Engineer
+- Reduced nightly ETL runtime by 45% by migrating 120 jobs to Spark
+- Led a team of 4 engineers delivering a real-time fraud pipeline
+Globex - Data Engineer
+- Built CI/CD for 60 Airflow DAGs, lowering failed deploys by 70%
+
+SKILLS
+Python, SQL, Spark, Airflow, AWS, Docker
+"""
+
+CANNED_EVALUATION = json.dumps({
+    "overall_score": 82,
+    "score_breakdown": {"keyword_match": 4, "structure": 4, "metrics_quantification": 4, "action_verbs": 5},
+    "missing_keywords": ["kafka", "terraform", "dbt", "snowflake", "looker"],
+    "quick_wins": ["Add a Kafka project", "Mention Terraform in skills"],
+})
+
+_RESUME_BLOCK_RE = re.compile(r"--- START ---\n(.*?)\n--- END ---", re.S)
+
+
+def parse_latency(spec: str):
+    """Turns a latency spec such as "uniform:1,3" into a zero-argument sampler (seconds)."""
+    kind, _, args = spec.partition(":")
+    params = [float(x) for x in args.split(",") if x]
+    if kind == "constant":
+        return lambda: params[0]
+    if kind == "uniform":
+        return lambda: random.uniform(params[0], params[1])
+    if kind == "lognormal":
+        return lambda: random.lognormvariate(params[0], params[1])
+    raise ValueError(f"Unknown latency distribution: {spec}")
+
+
+def canned_answer(prompt: str) -> str:
+    """Picks a response shaped like what the prompt's pipeline stage expects."""
+    if "mapping bullet IDs" in prompt:
+        return json.dumps({"B1": "Cut nightly ETL runtime by 45% (6h to 3.3h) by migrating 120 jobs to Spark"})
+    if "'overall_score'" in prompt:
+        return CANNED_EVALUATION
+    block = _RESUME_BLOCK_RE.search(prompt)
+    return block.group(1) if block and "Raw Resume Text" in prompt else CANNED_RESUME
+
+
+def make_handler(sample_latency):
+    class StubHandler(BaseHTTPRequestHandler):
+        protocol_version = "HTTP/1.1"
+
+        def log_message(self, *args):
+            pass
+
+        def _send_json(self, status, payload):
+            body = json.dumps(payload).encode()
+            self.send_response(status)
+            self.send_header("Content-Type", "application/json")
+            self.send_header("Content-Length", str(len(body)))
+            self.end_headers()
+            self.wfile.write(body)
+
+        def do_GET(self):
+            if self.path.rstrip("/").endswith("/models"):
+                self._send_json(200, {"object": "list", "data": [{"id": "stub", "object": "model"}]})
+            else:
+                self._send_json(200, {"status": "ok"})
+
+        def do_POST(self):
+            if not self.path.rstrip("/").endswith("/chat/completions"):
+                self._send_json(404, {"error": {"message": f"Unknown path {self.path}"}})
+                return
+            request = json.loads(self.rfile.read(int(self.headers.get("Content-Length", 0))) or b"{}")
+            prompt = "\n".join(str(m.get("content", "")) for m in request.get("messages", []))
+            time.sleep(sample_latency())
+
+            answer = canned_answer(prompt)
+            content = f"Thought: I now can give a great answer\nFinal Answer: {answer}"
+            prompt_tokens, completion_tokens = len(prompt) // 4, len(content) // 4
+            self._send_json(200, {
+                "id": f"chatcmpl-{uuid.uuid4().hex}",
+                "object": "chat.completion",
+                "created": int(time.time()),
+                "model": request.get("model", "stub"),
+                "choices": [{
+                    "index": 0,
+                    "message": {"role": "assistant", "content": content},
+                    "finish_reason": "stop",
+                }],
+                "usage": {
+                    "prompt_tokens": prompt_tokens,
+                    "completion_tokens": completion_tokens,
+                    "total_tokens": prompt_tokens + completion_tokens,
+                },
+            })
+
+    return StubHandler
+
+
+def serve(port: int, latency: str):
+    server = ThreadingHTTPServer(("127.0.0.1", port), make_handler(parse_latency(latency)))
+    server.daemon_threads = True
+    server.serve_forever()
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--port", type=int, default=8808)
+    parser.add_argument("--latency", default="constant:1", help="Latency distribution spec (see above)")
+    args = parser.parse_args()
+    print(f"Stub LLM listening on http://127.0.0.1:{args.port}/v1 with latency {args.latency}")
+    serve(args.port, args.latency)
+
+
+if __name__ == "__main__":
+    main()
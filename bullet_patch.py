@@ -0,0 +1,135 @@
+import json
+import re
+from typing import Dict, List, Optional, Tuple
+
+# A bullet line is any line whose first non-blank character is a list marker
+# followed by a space. The parser normalizes markers to "-", but the writer
+# agent occasionally emits "*" or "•", so all three are recognized.
+_BULLET_RE = re.compile(r"^(\s*)([-*•])\s+(.*\S)\s*$")
+_MARKER_RE = re.compile(r"^\s*[-*•]\s+")
+
+# Section headings. A line only counts as one if it is heading-shaped (a markdown
+# "#" heading, fully bold, all upper-case or ending with a colon) and the whole
+# line is a known section name, so job titles such as "Globex - Training Lead"
+# or "CONTACT CENTER MANAGER" never end the experience section. Names may be
+# combined with "&", "/" or "and" ("Skills & Tools").
+_EXPERIENCE_SECTION_RE = re.compile(
+    r"((professional|work|relevant|industry|career)\s+)?experience"
+    r"|(employment|work|career|professional)\s+history|employment",
+    re.I,
+)
+_OTHER_SECTION_RE = re.compile(
+    r"((technical|core|key|professional)\s+)?(skills|competencies)|tools|technologies"
+    r"|education|((professional|career)\s+)?summary|(professional\s+)?profile|(career\s+)?objective"
+    r"|certifications?|licenses?|((personal|key|selected)\s+)?projects|awards|honors|languages"
+    r"|interests|hobbies|publications|volunteer(ing)?(\s+experience)?|references|training|courses"
+    r"|(key\s+)?achievements|contact(\s+(information|details))?",
+    re.I,
+)
+_HEADING_MARKUP_RE = re.compile(r"^#{1,6}\s+(.+)$|^\*\*([^*]+)\*\*:?$")
+_SECTION_JOINER_RE = re.compile(r"\s*(?:&|/|\band\b)\s*", re.I)
+
+
+class BulletPatchError(ValueError):
+    """Raised when a refiner edit list cannot be parsed or applied."""
+
+
+def _section_heading(line: str) -> Optional[bool]:
+    """
+    Returns True for a work-experience heading, False for any other known
+    resume section heading, and None for every other line (including job
+    title and company lines inside the experience section).
+    """
+    stripped = line.strip()
+    markup = _HEADING_MARKUP_RE.match(stripped)
+    text = (markup.group(1) or markup.group(2)) if markup else stripped
+    text = text.replace("**", "").strip()
+    if not (markup or text.isupper() or text.endswith(":")):
+        return None
+
+    parts = [p for p in _SECTION_JOINER_RE.split(text.rstrip(":").strip()) if p]
+    kinds = [
+        True if _EXPERIENCE_SECTION_RE.fullmatch(p) else False if _OTHER_SECTION_RE.fullmatch(p) else None
+        for p in parts
+    ]
+    if not kinds or None in kinds:
+        return None
+    return any(kinds)
+
+
+def index_bullets(text: str) -> List[Tuple[str, int, str]]:
+    """
+    Assigns a stable ID to every bullet line in the work experience section.
+
+    Bullets under other headings (skills, education, summary, ...) are not
+    indexed, so patch mode edits the same part of the resume as full mode.
+
+    Returns:
+        list: (bullet_id, line_number, bullet_text) tuples, with IDs "B1", "B2", ...
+    """
+    bullets = []
+    in_experience = False
+    for line_number, line in enumerate(text.splitlines()):
+        match = _BULLET_RE.match(line)
+        if match:
+            if in_experience:
+                bullets.append((f"B{len(bullets) + 1}", line_number, match.group(3)))
+            continue
+        section = _section_heading(line)
+        if section is not None:
+            in_experience = section
+    return bullets
+
+
+def format_bullets_for_prompt(bullets: List[Tuple[str, int, str]]) -> str:
+    """Renders indexed bullets as "ID: text" lines for the refiner prompt."""
+    return "\n".join(f"{bullet_id}: {bullet_text}" for bullet_id, _, bullet_text in bullets)
+
+
+def parse_bullet_patch(raw_output: str) -> Dict[str, str]:
+    """
+    Parses the refiner's edit list into a {bullet_id: replacement_text} dict.
+
+    The model is asked for a bare JSON object, but code fences or a sentence
+    around it are tolerated by reading from the first "{" to the last "}".
+    """
+    start, end = raw_output.find("{"), raw_output.rfind("}")
+    if start == -1 or end < start:
+        raise BulletPatchError("No JSON object found in refiner output.")
+    try:
+        patch = json.loads(raw_output[start:end + 1])
+    except json.JSONDecodeError as e:
+        raise BulletPatchError(f"Refiner output is not valid JSON: {e}") from e
+    if not isinstance(patch, dict):
+        raise BulletPatchError("Refiner output must be a JSON object.")
+    for bullet_id, replacement in patch.items():
+        if not isinstance(replacement, str) or not replacement.strip():
+            raise BulletPatchError(f"Replacement for {bullet_id} must be a non-empty string.")
+    return {str(k).strip(): v for k, v in patch.items()}
+
+
+def apply_bullet_patch(text: str, patch: Dict[str, str]) -> str:
+    """
+    Applies an edit list to the resume, replacing only the referenced bullets.
+
+    Indentation and the original list marker are preserved, and every other
+    line is returned unchanged.
+
+    Raises:
+        BulletPatchError: If the patch references a bullet ID that does not exist
+    """
+    lines = text.splitlines()
+    by_id = {bullet_id: line_number for bullet_id, line_number, _ in index_bullets(text)}
+
+    unknown = [bullet_id for bullet_id in patch if bullet_id not in by_id]
+    if unknown:
+        raise BulletPatchError(f"Unknown bullet IDs in patch: {', '.join(unknown)}")
+
+    for bullet_id, replacement in patch.items():
+        line_number = by_id[bullet_id]
+        match = _BULLET_RE.match(lines[line_number])
+        # The model sometimes repeats the marker or the ID prefix; drop both.
+        new_text = _MARKER_RE.sub("", replacement.strip())
+        new_text = re.sub(rf"^{re.escape(bullet_id)}\s*:\s*", "", new_text)
+        lines[line_number] = f"{match.group(1)}{match.group(2)} {new_text}"
+    return "\n".join(lines)
@@ -1,6 +1,7 @@
 import os
 import sys
 from dotenv import load_dotenv
+from tracing import get_trace_sample_rate, get_trace_sink, is_quiet
 
 def setup_environment():
     """
@@ -27,8 +28,13 @@ def setup_environment():
     os.environ.setdefault("OPENAI_MODEL_NAME", "llama-3.1-8b-instant")
     
     # Configure LangSmith Tracing
+    # ATS_TRACE_SINK=file/off keeps runs away from LangSmith even when a key is set;
+    # per-run sampling (ATS_TRACE_SAMPLE_RATE) is applied in crew.run_pipeline.
     langchain_api_key = os.getenv("LANGCHAIN_API_KEY")
-    if not langchain_api_key:
+    if get_trace_sink() != "langsmith":
+        print(f"INFO: ATS_TRACE_SINK={get_trace_sink()}. LangSmith tracing will be disabled.")
+        os.environ["LANGCHAIN_TRACING_V2"] = "false"
+    elif not langchain_api_key:
         print("WARNING: LANGCHAIN_API_KEY not set. Tracing will be disabled.")
         os.environ["LANGCHAIN_TRACING_V2"] = "false"
     else:
@@ -55,7 +61,7 @@ def configure_model_for_run(model_name: str):
     # Re-assert LangSmith tracing configuration to ensure it's active
     # This is critical because CrewAI may reinitialize the LLM
     langchain_api_key = os.getenv("LANGCHAIN_API_KEY")
-    if langchain_api_key:
+    if langchain_api_key and get_trace_sink() == "langsmith":
         os.environ["LANGCHAIN_TRACING_V2"] = "true"
         os.environ["LANGCHAIN_API_KEY"] = langchain_api_key
         os.environ["LANGCHAIN_PROJECT"] = os.getenv("LANGCHAIN_PROJECT", "ats-resume-agent")
@@ -65,6 +71,8 @@ def configure_model_for_run(model_name: str):
         "model": os.environ["OPENAI_MODEL_NAME"],
         "tracing_enabled": os.environ.get("LANGCHAIN_TRACING_V2") == "true",
         "project": os.environ.get("LANGCHAIN_PROJECT"),
+        "trace_sink": get_trace_sink(),
+        "trace_sample_rate": get_trace_sample_rate(),
     }
 
 def get_config_status():
@@ -77,6 +85,9 @@ def get_config_status():
         "tracing_enabled": os.getenv("LANGCHAIN_TRACING_V2") == "true",
         "langsmith_key_set": bool(os.getenv("LANGCHAIN_API_KEY")),
         "langsmith_project": os.getenv("LANGCHAIN_PROJECT"),
+        "trace_sink": get_trace_sink(),
+        "trace_sample_rate": get_trace_sample_rate(),
+        "quiet_mode": is_quiet(),
     }
 
 # Initialize environment on module import
@@ -1,42 +1,128 @@
 import os
 from crewai import Crew, Process
-from langsmith import traceable
+from langsmith import traceable, tracing_context
 from agents import (
     build_parser_agent,
     build_ats_writer_agent,
     build_evaluator_agent,
     build_refiner_agent
 )
+from bullet_patch import (
+    BulletPatchError,
+    apply_bullet_patch,
+    format_bullets_for_prompt,
+    index_bullets,
+    parse_bullet_patch
+)
+from jd_analysis import extract_jd_keywords
+from tracing import get_trace_sink, is_quiet, sampled_run, should_sample, span
 from tasks import (
     parse_resume_task,
     rewrite_for_ats_task,
     evaluate_ats_task,
-    refine_bullets_task
+    refine_bullets_task,
+    refine_bullets_patch_task
 )
 
-@traceable(run_type="chain", name="ATS Resume Pipeline")
-def run_pipeline(raw_resume_text: str, job_title: str, job_description: str):
+# "patch" asks the refiner for a compact edit list of bullet IDs, "full" asks it to
+# return the whole resume. Patch mode falls back to full mode if the edit list
+# cannot be applied.
+REFINE_MODES = ("patch", "full")
+
+# Placeholders returned in place of a stage's output when that stage produced nothing
+FAILED_OUTPUTS = ("Parsing failed.", "Rewriting failed.", "Refining failed.", "Evaluation failed.")
+
+
+def _log(message: str):
+    """Prints progress messages unless quiet mode (ATS_QUIET) is on."""
+    if not is_quiet():
+        print(message)
+
+
+def is_complete_result(result) -> bool:
+    """True if no output of a `run_pipeline` result is a failure placeholder."""
+    return not any(output in FAILED_OUTPUTS for output in result)
+
+
+def _kickoff(agents, tasks):
+    """Runs a single-stage crew and logs failures the same way for every stage."""
+    crew = Crew(
+        agents=agents,
+        tasks=tasks,
+        process=Process.sequential,
+        verbose=not is_quiet()
+    )
+    try:
+        return crew.kickoff()
+    except Exception as e:
+        print(f"\n❌ Pipeline failed with error: {str(e)}\n")
+        raise
+
+
+def _refine_with_patch(refiner, rewritten: str) -> str:
+    """
+    Refines the work experience bullets of `rewritten` via an edit list applied locally.
+
+    Raises:
+        BulletPatchError: If there are no experience bullets or the edit list cannot be applied
+    """
+    bullets = index_bullets(rewritten)
+    if not bullets:
+        raise BulletPatchError("No work experience bullet points found in the rewritten resume.")
+    
+    t_refine = refine_bullets_patch_task(refiner, format_bullets_for_prompt(bullets))
+    _kickoff([refiner], [t_refine])
+    if not t_refine.output:
+        raise BulletPatchError("Refiner produced no output.")
+    
+    patch = parse_bullet_patch(t_refine.output.raw)
+    _log(f"🩹 Applying refiner patch to {len(patch)} of {len(bullets)} bullet points")
+    return apply_bullet_patch(rewritten, patch)
+
+
+def run_pipeline(raw_resume_text: str, job_title: str, job_description: str, refine_mode: str = None):
     """
     Executes the complete ATS resume optimization pipeline.
     
-    This function is decorated with @traceable to ensure all operations
-    are properly tracked in LangSmith for monitoring and debugging.
+    Each call is one trace sampling decision (ATS_TRACE_SAMPLE_RATE). Sampled
+    runs are traced to LangSmith or to the local file sink, depending on
+    ATS_TRACE_SINK. Unsampled runs skip trace serialization entirely.
     
     Args:
         raw_resume_text: The raw text extracted from the resume file
         job_title: The target job title for optimization
         job_description: The full job description to optimize against
+        refine_mode: "patch" or "full" (defaults to $ATS_REFINE_MODE, then "patch")
     
     Returns:
         tuple: (cleaned_text, rewritten_text, final_resume, evaluation)
     """
+    sampled = should_sample()
+    # langsmith caches its environment lookups, so the per-run decision is passed
+    # through its tracing context rather than by toggling LANGCHAIN_TRACING_V2.
+    langsmith_enabled = (
+        sampled
+        and get_trace_sink() == "langsmith"
+        and os.getenv("LANGCHAIN_TRACING_V2") == "true"
+    )
+    with sampled_run(sampled), tracing_context(enabled=langsmith_enabled):
+        with span("pipeline", model=os.getenv("OPENAI_MODEL_NAME", "unknown")):
+            return _run_pipeline_traced(raw_resume_text, job_title, job_description, refine_mode)
+
+
+@traceable(run_type="chain", name="ATS Resume Pipeline")
+def _run_pipeline_traced(raw_resume_text: str, job_title: str, job_description: str, refine_mode: str = None):
+    refine_mode = refine_mode or os.getenv("ATS_REFINE_MODE", "patch")
+    if refine_mode not in REFINE_MODES:
+        raise ValueError(f"refine_mode must be one of {REFINE_MODES}, got '{refine_mode}'")
+    
     # Log the model being used for this run
     model_name = os.getenv("OPENAI_MODEL_NAME", "unknown")
-    print(f"\n{'='*60}")
-    print(f"🚀 Starting ATS Pipeline with model: {model_name}")
-    print(f"📊 LangSmith Tracing: {os.getenv('LANGCHAIN_TRACING_V2', 'not set')}")
-    print(f"📁 LangSmith Project: {os.getenv('LANGCHAIN_PROJECT', 'not set')}")
-    print(f"{'='*60}\n")
+    _log(f"\n{'='*60}")
+    _log(f"🚀 Starting ATS Pipeline with model: {model_name}")
+    _log(f"📊 LangSmith Tracing: {os.getenv('LANGCHAIN_TRACING_V2', 'not set')}")
+    _log(f"📁 LangSmith Project: {os.getenv('LANGCHAIN_PROJECT', 'not set')}")
+    _log(f"{'='*60}\n")
     
     # Build all agents
     parser = build_parser_agent()
@@ -44,33 +130,45 @@ def run_pipeline(raw_resume_text: str, job_title: str, job_description: str):
     refiner = build_refiner_agent()
     evaluator = build_evaluator_agent()
     
-    # Create all tasks with proper context chaining
+    # JD keyword extraction is a local regex pass over the posting that takes well
+    # under a millisecond, so it runs inline before the first LLM call.
+    with span("jd_keywords"):
+        jd_keywords = extract_jd_keywords(job_title, job_description)
+
     t_parse = parse_resume_task(parser, raw_resume_text)
-    t_rewrite = rewrite_for_ats_task(writer, job_title, job_description, context=[t_parse])
-    t_refine = refine_bullets_task(refiner, context=[t_rewrite])
-    t_eval = evaluate_ats_task(evaluator, job_title, job_description, context=[t_refine])
+    with span("parse"):
+        _kickoff([parser], [t_parse])
     
-    # Create and execute the crew
-    # The crew automatically picks up the LLM configuration from environment variables
-    crew = Crew(
-        agents=[parser, writer, refiner, evaluator],
-        tasks=[t_parse, t_rewrite, t_refine, t_eval],
-        process=Process.sequential,
-        verbose=True
-    )
+    _log(f"🔑 Extracted {len(jd_keywords)} job keywords: {', '.join(jd_keywords)}")
     
-    # Execute the crew
-    try:
-        result = crew.kickoff()
-        print(f"\n✅ Pipeline completed successfully with {model_name}\n")
-    except Exception as e:
-        print(f"\n❌ Pipeline failed with error: {str(e)}\n")
-        raise
+    # Downstream tasks receive the compact keyword list instead of the full JD text.
+    # `t_parse` already carries its output, so it can serve as context for the next crew.
+    t_rewrite = rewrite_for_ats_task(writer, job_title, jd_keywords, context=[t_parse])
+    with span("rewrite"):
+        _kickoff([writer], [t_rewrite])
     
-    # Extract outputs from each task
     cleaned = t_parse.output.raw if t_parse.output else "Parsing failed."
     rewritten = t_rewrite.output.raw if t_rewrite.output else "Rewriting failed."
-    final_resume = t_refine.output.raw if t_refine.output else "Refining failed."
+    
+    final_resume = None
+    if refine_mode == "patch":
+        try:
+            with span("refine", mode="patch"):
+                final_resume = _refine_with_patch(refiner, rewritten)
+        except BulletPatchError as e:
+            print(f"⚠️ Patch refinement failed ({e}); falling back to full-text refinement")
+    
+    if final_resume is None:
+        t_refine = refine_bullets_task(refiner, context=[t_rewrite])
+        with span("refine", mode="full"):
+            _kickoff([refiner], [t_refine])
+        final_resume = t_refine.output.raw if t_refine.output else "Refining failed."
+    
+    t_eval = evaluate_ats_task(evaluator, job_title, jd_keywords, final_resume)
+    with span("evaluate"):
+        _kickoff([evaluator], [t_eval])
+    _log(f"\n✅ Pipeline completed successfully with {model_name}\n")
+    
     evaluation = t_eval.output.raw if t_eval.output else "Evaluation failed."
     
     return cleaned, rewritten, final_resume, evaluation
\ No newline at end of file
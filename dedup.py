@@ -0,0 +1,188 @@
+import hashlib
+import re
+import struct
+import threading
+from collections import OrderedDict
+from dataclasses import dataclass
+from typing import Any, Dict, List, Optional, Set, Tuple
+
+# MinHash parameters. 128 permutations split into 16 bands of 8 rows gives an
+# LSH candidate probability of ~0.95 at Jaccard 0.8 and ~0.06 at Jaccard 0.5,
+# so lightly edited re-uploads collide while unrelated resumes rarely do.
+# Candidates are then checked against the index threshold exactly.
+NUM_PERM = 128
+BANDS = 16
+ROWS = NUM_PERM // BANDS
+SHINGLE_SIZE = 3
+
+_MERSENNE_PRIME = (1 << 61) - 1
+_MAX_HASH = (1 << 32) - 1
+_WORD_RE = re.compile(r"[a-z0-9+#]+")
+_EMAIL_RE = re.compile(r"[\w.+-]+@[\w-]+(?:\.[\w-]+)+")
+_PHONE_RE = re.compile(r"\+?\d[\d\s().-]{6,}\d")
+
+
+def _permutations(num_perm: int) -> List[Tuple[int, int]]:
+    # Deterministic (a, b) pairs so signatures are comparable across processes and restarts.
+    params = []
+    for i in range(num_perm):
+        digest = hashlib.blake2b(f"minhash-{i}".encode(), digest_size=16).digest()
+        a, b = struct.unpack("<QQ", digest)
+        params.append((a % (_MERSENNE_PRIME - 1) + 1, b % _MERSENNE_PRIME))
+    return params
+
+
+_PERMUTATIONS = _permutations(NUM_PERM)
+
+
+def shingles(text: str, size: int = SHINGLE_SIZE) -> Set[int]:
+    """
+    Returns the set of hashed word n-grams of `text`.
+
+    Text is lower-cased and reduced to word tokens first, so whitespace,
+    punctuation and bullet-glyph differences introduced by PDF/DOCX extraction
+    do not count as edits.
+    """
+    words = _WORD_RE.findall(text.lower())
+    if len(words) < size:
+        grams = {" ".join(words)} if words else set()
+    else:
+        grams = {" ".join(words[i:i + size]) for i in range(len(words) - size + 1)}
+    return {
+        struct.unpack("<I", hashlib.blake2b(g.encode(), digest_size=4).digest())[0]
+        for g in grams
+    }
+
+
+def minhash_signature(text: str) -> Tuple[int, ...]:
+    """Computes a NUM_PERM-long MinHash signature for `text`."""
+    hashed = shingles(text)
+    if not hashed:
+        return tuple([_MAX_HASH] * NUM_PERM)
+    return tuple(
+        min(((a * h + b) % _MERSENNE_PRIME) & _MAX_HASH for h in hashed)
+        for a, b in _PERMUTATIONS
+    )
+
+
+def estimate_similarity(sig_a: Tuple[int, ...], sig_b: Tuple[int, ...]) -> float:
+    """Estimates the Jaccard similarity of two texts from their signatures."""
+    return sum(1 for x, y in zip(sig_a, sig_b) if x == y) / len(sig_a)
+
+
+def job_key(job_title: str, job_description: str, model_name: str) -> str:
+    """
+    Identifies the non-resume inputs of a run. A cached result is only reused
+    for the same job posting and model, since either changes the output.
+    """
+    normalized = re.sub(r"\s+", " ", f"{job_title}\n{job_description}".lower()).strip()
+    return hashlib.sha256(f"{model_name}\n{normalized}".encode()).hexdigest()
+
+
+def contact_fingerprint(resume_text: str) -> str:
+    """
+    Identifies whose resume this is: the first non-empty line (usually the
+    name) plus every email address and phone number in the text. Two resumes
+    that differ only here are different people and must never share results.
+    """
+    first_line = next((line for line in resume_text.splitlines() if line.strip()), "")
+    emails = sorted({e.lower() for e in _EMAIL_RE.findall(resume_text)})
+    digits = (re.sub(r"\D", "", p) for p in _PHONE_RE.findall(resume_text))
+    # Phone numbers have 9-15 digits; shorter runs are dates such as "2019 - 2020"
+    phones = sorted({d for d in digits if 9 <= len(d) <= 15})
+    return "\n".join([" ".join(_WORD_RE.findall(first_line.lower())), *emails, *phones])
+
+
+def match_key(job_title: str, job_description: str, model_name: str, resume_text: str) -> str:
+    """
+    Index key for a run: the job key scoped to the resume's owner, so a match
+    requires the same job, model and contact details, not just similar text.
+    """
+    owner = hashlib.sha256(contact_fingerprint(resume_text).encode()).hexdigest()
+    return f"{job_key(job_title, job_description, model_name)}:{owner}"
+
+
+@dataclass
+class DuplicateMatch:
+    """A previous run whose resume is near-identical to the one being submitted."""
+    run_id: str
+    similarity: float
+    result: Any
+
+
+class NearDuplicateIndex:
+    """
+    In-memory LSH index over the resumes of recent pipeline runs.
+
+    Keeps at most `capacity` runs, evicting the least recently matched first.
+    Thread-safe, so a single instance can be shared across Streamlit sessions.
+
+    Args:
+        threshold: Minimum estimated Jaccard similarity to report a match
+        capacity: Maximum number of recent runs to remember
+    """
+
+    def __init__(self, threshold: float = 0.85, capacity: int = 1000):
+        if not 0.0 < threshold <= 1.0:
+            raise ValueError("threshold must be in (0, 1]")
+        self.threshold = threshold
+        self.capacity = capacity
+        self._runs: "OrderedDict[str, Tuple[str, Tuple[int, ...], Any]]" = OrderedDict()
+        self._buckets: Dict[Tuple[str, int, Tuple[int, ...]], Set[str]] = {}
+        self._lock = threading.Lock()
+
+    def __len__(self) -> int:
+        return len(self._runs)
+
+    @staticmethod
+    def _bands(key: str, signature: Tuple[int, ...]):
+        for band in range(BANDS):
+            yield (key, band, signature[band * ROWS:(band + 1) * ROWS])
+
+    def find(self, resume_text: str, key: str) -> Optional[DuplicateMatch]:
+        """
+        Returns the most similar recent run for the same job key, if it meets
+        the threshold. `resume_text` should be the output of `detect_and_extract`.
+        """
+        return self.find_signature(minhash_signature(resume_text), key)
+
+    def find_signature(self, signature: Tuple[int, ...], key: str) -> Optional[DuplicateMatch]:
+        with self._lock:
+            candidates = set()
+            for bucket in self._bands(key, signature):
+                candidates |= self._buckets.get(bucket, set())
+
+            best = None
+            for run_id in candidates:
+                _, other, result = self._runs[run_id]
+                similarity = estimate_similarity(signature, other)
+                if similarity >= self.threshold and (best is None or similarity > best.similarity):
+                    best = DuplicateMatch(run_id, similarity, result)
+            if best is not None:
+                self._runs.move_to_end(best.run_id)
+            return best
+
+    def add(self, run_id: str, resume_text: str, key: str, result: Any,
+            signature: Optional[Tuple[int, ...]] = None) -> None:
+        """
+        Records a finished run so later near-identical submissions can reuse it.
+        Pass `signature` if it was already computed for a preceding lookup.
+        """
+        signature = signature or minhash_signature(resume_text)
+        with self._lock:
+            if run_id in self._runs:
+                self._remove(run_id)
+            self._runs[run_id] = (key, signature, result)
+            for bucket in self._bands(key, signature):
+                self._buckets.setdefault(bucket, set()).add(run_id)
+            while len(self._runs) > self.capacity:
+                self._remove(next(iter(self._runs)))
+
+    def _remove(self, run_id: str) -> None:
+        key, signature, _ = self._runs.pop(run_id)
+        for bucket in self._bands(key, signature):
+            members = self._buckets.get(bucket)
+            if members is not None:
+                members.discard(run_id)
+                if not members:
+                    del self._buckets[bucket]
@@ -0,0 +1,220 @@
+import os
+import re
+import zipfile
+from concurrent.futures import ProcessPoolExecutor
+from io import BytesIO
+from typing import BinaryIO, Iterable, List, Tuple, Union
+from xml.sax.saxutils import escape
+
+# A minimal WordprocessingML package written straight into a zip stream.
+# Unlike `utils.txt_to_docx_bytes`, this never builds a python-docx object
+# tree: paragraphs are serialized one line at a time as they are classified.
+
+_CONTENT_TYPES = (
+    '<?xml version="1.0" encoding="UTF-8" standalone="yes"?>'
+    '<Types xmlns="http://schemas.openxmlformats.org/package/2006/content-types">'
+    '<Default Extension="rels" ContentType="application/vnd.openxmlformats-package.relationships+xml"/>'
+    '<Default Extension="xml" ContentType="application/xml"/>'
+    '<Override PartName="/word/document.xml" '
+    'ContentType="application/vnd.openxmlformats-officedocument.wordprocessingml.document.main+xml"/>'
+    '<Override PartName="/word/styles.xml" '
+    'ContentType="application/vnd.openxmlformats-officedocument.wordprocessingml.styles+xml"/>'
+    '<Override PartName="/word/numbering.xml" '
+    'ContentType="application/vnd.openxmlformats-officedocument.wordprocessingml.numbering+xml"/>'
+    '</Types>'
+)
+
+_ROOT_RELS = (
+    '<?xml version="1.0" encoding="UTF-8" standalone="yes"?>'
+    '<Relationships xmlns="http://schemas.openxmlformats.org/package/2006/relationships">'
+    '<Relationship Id="rId1" '
+    'Type="http://schemas.openxmlformats.org/officeDocument/2006/relationships/officeDocument" '
+    'Target="word/document.xml"/>'
+    '</Relationships>'
+)
+
+_DOCUMENT_RELS = (
+    '<?xml version="1.0" encoding="UTF-8" standalone="yes"?>'
+    '<Relationships xmlns="http://schemas.openxmlformats.org/package/2006/relationships">'
+    '<Relationship Id="rId1" '
+    'Type="http://schemas.openxmlformats.org/officeDocument/2006/relationships/styles" '
+    'Target="styles.xml"/>'
+    '<Relationship Id="rId2" '
+    'Type="http://schemas.openxmlformats.org/officeDocument/2006/relationships/numbering" '
+    'Target="numbering.xml"/>'
+    '</Relationships>'
+)
+
+_W_NS = 'xmlns:w="http://schemas.openxmlformats.org/wordprocessingml/2006/main"'
+
+_STYLES = (
+    '<?xml version="1.0" encoding="UTF-8" standalone="yes"?>'
+    f'<w:styles {_W_NS}>'
+    '<w:style w:type="paragraph" w:default="1" w:styleId="Normal"><w:name w:val="Normal"/>'
+    '<w:pPr><w:spacing w:after="60"/></w:pPr>'
+    '<w:rPr><w:rFonts w:ascii="Calibri" w:hAnsi="Calibri"/><w:sz w:val="22"/></w:rPr></w:style>'
+    '<w:style w:type="paragraph" w:styleId="Heading1"><w:name w:val="heading 1"/>'
+    '<w:basedOn w:val="Normal"/><w:next w:val="Normal"/>'
+    '<w:pPr><w:keepNext/><w:spacing w:before="240" w:after="80"/><w:outlineLvl w:val="0"/></w:pPr>'
+    '<w:rPr><w:b/><w:sz w:val="28"/></w:rPr></w:style>'
+    '<w:style w:type="paragraph" w:styleId="ListBullet"><w:name w:val="List Bullet"/>'
+    '<w:basedOn w:val="Normal"/>'
+    '<w:pPr><w:numPr><w:numId w:val="1"/></w:numPr></w:pPr></w:style>'
+    '</w:styles>'
+)
+
+_NUMBERING = (
+    '<?xml version="1.0" encoding="UTF-8" standalone="yes"?>'
+    f'<w:numbering {_W_NS}>'
+    '<w:abstractNum w:abstractNumId="0"><w:lvl w:ilvl="0"><w:start w:val="1"/>'
+    '<w:numFmt w:val="bullet"/><w:lvlText w:val="•"/><w:lvlJc w:val="left"/>'
+    '<w:pPr><w:ind w:left="360" w:hanging="360"/></w:pPr></w:lvl></w:abstractNum>'
+    '<w:num w:numId="1"><w:abstractNumId w:val="0"/></w:num>'
+    '</w:numbering>'
+)
+
+_DOCUMENT_HEAD = (
+    '<?xml version="1.0" encoding="UTF-8" standalone="yes"?>'
+    f'<w:document {_W_NS}><w:body>'
+).encode("utf-8")
+_DOCUMENT_TAIL = b'<w:sectPr><w:pgSz w:w="12240" w:h="15840"/></w:sectPr></w:body></w:document>'
+
+# Paragraph style for each line kind; body paragraphs use the default "Normal" style.
+STYLE_FOR_KIND = {"heading": "Heading1", "bullet": "ListBullet"}
+
+_BULLET_RE = re.compile(r"^\s*[-*•]\s+")
+_MARKDOWN_HEADING_RE = re.compile(r"^\s*#{1,6}\s+")
+# A line that is bold from end to end, e.g. "**Work Experience**", the LLMs' usual heading form.
+_BOLD_LINE_RE = re.compile(r"\*\*[^*]+\*\*:?")
+# Upper-case/colon headings are words only; "C++" or "SQL, AWS" are skill lines, not headings.
+_PLAIN_HEADING_RE = re.compile(r"[^\W\d_][\w\s&/'().-]*:?")
+# Characters allowed in batch export file names
+_UNSAFE_NAME_RE = re.compile(r"[^\w .-]")
+# XML 1.0 forbids most control characters; PDF extraction occasionally produces them.
+_INVALID_XML_RE = re.compile(r"[\x00-\x08\x0b\x0c\x0e-\x1f]")
+
+DestType = Union[str, os.PathLike, BinaryIO]
+
+
+def classify_line(line: str) -> Tuple[str, str]:
+    """
+    Classifies one line of pipeline output as a heading, bullet, blank or body line.
+
+    Headings are markdown headings, lines that are entirely bold (e.g.
+    "**Work Experience**"), or short lines of words that are upper-case or end
+    with a colon (e.g. "WORK EXPERIENCE", "Skills:"). Every heading must
+    contain at least two letters.
+
+    Returns:
+        tuple: (kind, text) with list markers, '#' and '**' markup removed
+    """
+    stripped = line.strip()
+    if not stripped:
+        return "blank", ""
+    if _BULLET_RE.match(stripped):
+        return "bullet", _BULLET_RE.sub("", stripped).replace("**", "")
+    unmarked = _MARKDOWN_HEADING_RE.sub("", stripped)
+    text = unmarked.replace("**", "").strip()
+    if sum(c.isalpha() for c in text) >= 2 and (
+        unmarked != stripped
+        or (len(text) <= 60 and _BOLD_LINE_RE.fullmatch(unmarked))
+        or (len(text) <= 40 and _PLAIN_HEADING_RE.fullmatch(text) and (text.isupper() or text.endswith(":")))
+    ):
+        return "heading", text.rstrip(":").strip()
+    return "body", text
+
+
+def _paragraph_xml(kind: str, text: str) -> str:
+    style = STYLE_FOR_KIND.get(kind)
+    ppr = f'<w:pPr><w:pStyle w:val="{style}"/></w:pPr>' if style else ""
+    if not text:
+        return f"<w:p>{ppr}</w:p>"
+    text = escape(_INVALID_XML_RE.sub("", text))
+    return f'<w:p>{ppr}<w:r><w:t xml:space="preserve">{text}</w:t></w:r></w:p>'
+
+
+def write_docx(text: str, dest: DestType) -> None:
+    """
+    Writes resume text as a styled DOCX file without building it in memory.
+
+    Headings map to "Heading 1", bullets to "List Bullet" and everything else to
+    "Normal". The document body is streamed into the zip member paragraph by
+    paragraph, so `dest` may be a path or any writable binary stream (including
+    non-seekable ones such as an HTTP response).
+
+    Args:
+        text: The resume text produced by the pipeline
+        dest: A file path or writable binary file object
+    """
+    # Level 1 deflate: the XML compresses well even at the fastest setting.
+    with zipfile.ZipFile(dest, "w", compression=zipfile.ZIP_DEFLATED, compresslevel=1) as zf:
+        zf.writestr("[Content_Types].xml", _CONTENT_TYPES)
+        zf.writestr("_rels/.rels", _ROOT_RELS)
+        zf.writestr("word/_rels/document.xml.rels", _DOCUMENT_RELS)
+        zf.writestr("word/styles.xml", _STYLES)
+        zf.writestr("word/numbering.xml", _NUMBERING)
+        with zf.open("word/document.xml", "w") as body:
+            body.write(_DOCUMENT_HEAD)
+            for line in text.splitlines():
+                body.write(_paragraph_xml(*classify_line(line)).encode("utf-8"))
+            body.write(_DOCUMENT_TAIL)
+
+
+def _export_one(job: Tuple[str, str, str]) -> str:
+    name, text, out_dir = job
+    path = os.path.join(out_dir, f"{name}.docx")
+    write_docx(text, path)
+    return path
+
+
+def _safe_name(name: str) -> str:
+    # Keep only the final path component and a conservative character set, so
+    # a name such as "../x" cannot write outside the output directory.
+    safe = _UNSAFE_NAME_RE.sub("_", os.path.basename(name.replace("\\", "/"))).strip(" .")
+    if not safe:
+        raise ValueError(f"Invalid document name: {name!r}")
+    return safe
+
+
+def export_batch(
+    documents: Iterable[Tuple[str, str]],
+    out_dir: str,
+    max_workers: int = None,
+    chunksize: int = 16,
+) -> List[str]:
+    """
+    Exports many pipeline outputs to DOCX files in parallel across processes.
+
+    Args:
+        documents: (name, text) pairs; each is written to `<out_dir>/<name>.docx`,
+            with the name reduced to a plain file name first
+        out_dir: Destination directory (created if missing)
+        max_workers: Process pool size (defaults to the CPU count)
+        chunksize: Documents handed to a worker per round-trip
+
+    Returns:
+        list: Paths of the written files, in input order
+
+    Raises:
+        ValueError: If a name is empty after sanitizing, or two names map to the same file
+    """
+    jobs = []
+    seen = set()
+    for name, text in documents:
+        safe = _safe_name(name)
+        # Compare case-insensitively: the output may land on a case-insensitive file system
+        if safe.casefold() in seen:
+            raise ValueError(f"Duplicate document name: {name!r}")
+        seen.add(safe.casefold())
+        jobs.append((safe, text, out_dir))
+
+    os.makedirs(out_dir, exist_ok=True)
+    with ProcessPoolExecutor(max_workers=max_workers) as pool:
+        return list(pool.map(_export_one, jobs, chunksize=chunksize))
+
+
+def docx_bytes(text: str) -> bytes:
+    """Convenience wrapper around `write_docx` for callers that need the bytes (e.g. Streamlit downloads)."""
+    out = BytesIO()
+    write_docx(text, out)
+    return out.getvalue()
@@ -0,0 +1,178 @@
+import re
+from collections import Counter
+from typing import List, Tuple
+
+# True function words. Job-title terms are only ever filtered against this set.
+FUNCTION_WORDS = frozenset("""
+a about above across after all also an and any are as at be been being both but by can could
+do does during each either etc for from has have having how if in including into is it its
+just may more most must of on one or other our out over per plus should such than that the
+their them then there these they this those through to under up us via was we well were what
+when where which while who why will with within without would you your
+""".split())
+
+# Words that carry no signal for ATS keyword matching. Kept deliberately small:
+# anything domain-specific (e.g. "data", "cloud", "product", "design") must
+# survive the filter. Boilerplate is pushed down by the ranking instead.
+STOPWORDS = FUNCTION_WORDS | frozenset("""
+preferred required requirements responsibilities role using work working year years
+ability able candidate candidates company experience excellent familiarity good great
+ideal job knowledge looking new opportunity position skills strong team understanding
+""".split())
+
+# Headings that open a requirements/skills section, and phrases that mark a
+# requirement line anywhere in the posting.
+_REQUIREMENT_HEADING_RE = re.compile(
+    r"requirement|qualification|skill|looking for|must.have|nice to have|bring|you have|"
+    r"tech stack|technolog|you.ll need|what we need",
+    re.I,
+)
+_REQUIREMENT_CUE_RE = re.compile(r"\b(experience (with|in)|proficien|knowledge of|familiar|expertise|years of|skills?\b|required|must)", re.I)
+_BULLET_PREFIX_RE = re.compile(r"^\s*[-•●▪*]\s*")
+
+_TOKEN_RE = re.compile(r"[A-Za-z][A-Za-z0-9+#./-]*[A-Za-z0-9+#]|[A-Za-z]")
+
+# Occurrences in requirement lines count this much more than elsewhere
+REQUIREMENT_WEIGHT = 3
+# Bonus for tokens written like a technology (AWS, gRPC, CI/CD, C++, Kotlin)
+TECHNICAL_BONUS = 4
+
+
+def normalize_job_description(job_description: str) -> str:
+    """
+    Normalizes a pasted job description: collapses whitespace and strips
+    bullet glyphs so that keyword extraction sees plain sentences.
+    """
+    text = re.sub(r"[•●▪–—*]", " ", job_description)
+    return re.sub(r"\s+", " ", text).strip()
+
+
+def _tokenize(text: str) -> List[str]:
+    return [t.lower().rstrip(".") for t in _TOKEN_RE.findall(text)]
+
+
+def _is_heading(line: str) -> bool:
+    return (
+        not _BULLET_PREFIX_RE.match(line)
+        and len(line) <= 60
+        and "," not in line
+        and not line.endswith(".")
+    )
+
+
+def _requirement_lines(job_description: str) -> List[Tuple[str, bool]]:
+    """
+    Splits the posting into (line, is_requirement) pairs. A line is a requirement
+    if it sits under a requirements/skills heading or contains a requirement cue.
+    """
+    lines = []
+    in_requirements = False
+    for raw in job_description.splitlines():
+        line = raw.strip()
+        if not line:
+            continue
+        if _is_heading(line):
+            in_requirements = bool(_REQUIREMENT_HEADING_RE.search(line))
+            lines.append((line, False))
+            continue
+        lines.append((line, in_requirements or bool(_REQUIREMENT_CUE_RE.search(line))))
+    return lines
+
+
+def _is_technical(token: str, line_initial: bool, in_requirement: bool) -> bool:
+    """
+    True for tokens written like a skill or technology: acronyms (AWS), mixed
+    case (gRPC, PostgreSQL), digits or symbols (C++, CI/CD, S3), or a capitalised
+    word in the middle of a requirement line (Kotlin, Kafka).
+    """
+    if len(token) > 1 and token.isupper():
+        return True
+    if any(c.isupper() for c in token[1:]) or any(c.isdigit() or c in "+#/" for c in token):
+        return True
+    return in_requirement and not line_initial and token[0].isupper()
+
+
+def extract_jd_keywords(job_title: str, job_description: str, max_keywords: int = 25) -> List[str]:
+    """
+    Extracts a compact, ranked list of keywords from a job description.
+
+    This runs locally and depends only on the job posting. Title terms come
+    first. The rest are ranked by a score that favours terms in requirement or
+    skill lines and terms written like technologies, so a hard skill mentioned
+    once (e.g. "Terraform") outranks boilerplate repeated in the company blurb.
+    Runs of adjacent technical tokens ("PCI DSS", "Spring Boot") are kept as
+    phrases, as are bigrams that repeat.
+
+    Args:
+        job_title: The target job title
+        job_description: The full job description text
+        max_keywords: Upper bound on the number of keywords returned
+
+    Returns:
+        list: Keywords ordered from most to least relevant
+    """
+    scores = Counter()
+    first_seen = {}
+    bigrams = Counter()
+    bigram_scores = Counter()
+    phrases = set()
+
+    for line, in_requirement in _requirement_lines(job_description):
+        weight = REQUIREMENT_WEIGHT if in_requirement else 1
+        raw_tokens = _TOKEN_RE.findall(normalize_job_description(_BULLET_PREFIX_RE.sub("", line)))
+        tokens = [t.rstrip(".") for t in raw_tokens]
+        technical = [_is_technical(t, i == 0, in_requirement) for i, t in enumerate(tokens)]
+        lowered = [t.lower() for t in tokens]
+
+        for term, is_tech in zip(lowered, technical):
+            if len(term) < 2 or (term in STOPWORDS and not is_tech):
+                continue
+            scores[term] += weight + (TECHNICAL_BONUS if is_tech else 0)
+            first_seen.setdefault(term, len(first_seen))
+
+        # Adjacent technical tokens form a phrase ("PCI DSS")
+        run = []
+        for term, is_tech in zip(lowered + [""], technical + [False]):
+            if is_tech and term not in STOPWORDS:
+                run.append(term)
+                continue
+            if len(run) > 1:
+                phrase = " ".join(run)
+                scores[phrase] += weight + TECHNICAL_BONUS + 1
+                first_seen.setdefault(phrase, len(first_seen))
+                phrases.add(phrase)
+            run = []
+
+        for first, second in zip(lowered, lowered[1:]):
+            if first in STOPWORDS or second in STOPWORDS or len(first) < 2 or len(second) < 2:
+                continue
+            bigrams[f"{first} {second}"] += 1
+            bigram_scores[f"{first} {second}"] += weight
+
+    # Repeated bigrams are a strong signal ("machine learning", "project management")
+    for phrase, count in bigrams.items():
+        if count >= 2 and phrase not in phrases:
+            scores[phrase] = bigram_scores[phrase] + 1
+            first_seen.setdefault(phrase, len(first_seen))
+
+    keywords: List[str] = []
+    seen = set()
+
+    def add(term: str):
+        if term not in seen and len(keywords) < max_keywords:
+            seen.add(term)
+            keywords.append(term)
+
+    for term in _tokenize(job_title):
+        if term not in FUNCTION_WORDS:
+            add(term)
+
+    for term, _ in sorted(scores.items(), key=lambda kv: (-kv[1], first_seen[kv[0]])):
+        add(term)
+
+    return keywords
+
+
+def format_keywords(keywords: List[str]) -> str:
+    """Renders a keyword list as a single comma-separated line for prompts."""
+    return ", ".join(keywords) if keywords else "(no keywords extracted)"
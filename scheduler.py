@@ -0,0 +1,295 @@
+import itertools
+import math
+import os
+import threading
+import time
+from contextlib import contextmanager
+from dataclasses import dataclass, field
+from typing import Callable, Dict, List, Optional
+
+# Models are scheduled in separate lanes so a burst of slow 70B runs cannot
+# occupy every slot and starve quick 8B runs. Unknown models use the fast lane.
+MODEL_LANES = {
+    "llama-3.1-8b-instant": "fast",
+    "llama-3.3-70b-versatile": "large",
+}
+
+# Starting estimates for a full pipeline run, refined by an EWMA of real runs
+DEFAULT_RUN_SECONDS = {"fast": 60.0, "large": 150.0}
+
+
+def lane_for_model(model_name: str) -> str:
+    """Returns the scheduling lane ("fast" or "large") for a model."""
+    return MODEL_LANES.get(model_name, "fast")
+
+
+def trust_proxy_headers() -> bool:
+    """Returns True when ATS_TRUST_PROXY_HEADERS says the app runs behind a trusted reverse proxy."""
+    return os.getenv("ATS_TRUST_PROXY_HEADERS", "").strip().lower() in ("1", "true", "yes", "on")
+
+
+def user_key(account: Optional[str], peer_address: Optional[str], forwarded_for: Optional[str] = None,
+             trust_proxy: Optional[bool] = None) -> Optional[str]:
+    """
+    Returns the identity per-user limits are keyed on, or None if there is none.
+
+    A logged-in account wins. Otherwise the socket peer address is used, since
+    request headers are chosen by the client. Only with `trust_proxy` (default:
+    ATS_TRUST_PROXY_HEADERS) is X-Forwarded-For read, and then only its last
+    hop, the one appended by the proxy; earlier hops come from the client.
+    """
+    if account:
+        return f"account:{account}"
+    if trust_proxy_headers() if trust_proxy is None else trust_proxy:
+        hops = [hop.strip() for hop in (forwarded_for or "").split(",") if hop.strip()]
+        if hops:
+            return f"ip:{hops[-1]}"
+    return f"ip:{peer_address}" if peer_address else None
+
+
+@dataclass
+class QueueStatus:
+    """Where a request stands: admitted, or its 1-based queue position and estimated wait."""
+    admitted: bool
+    position: int
+    expected_wait_s: float
+
+
+class SchedulerRejected(RuntimeError):
+    """
+    Raised when a request is not admitted to the queue at all.
+
+    Attributes:
+        reason: Human-readable reason for the rejection
+        queue_length: Number of requests already waiting in the lane
+        expected_wait_s: Estimated wait had the request been queued
+    """
+
+    def __init__(self, reason: str, queue_length: int, expected_wait_s: float):
+        super().__init__(reason)
+        self.reason = reason
+        self.queue_length = queue_length
+        self.expected_wait_s = expected_wait_s
+
+
+@dataclass
+class Ticket:
+    """A request for a pipeline slot, handed out by `PipelineScheduler.submit`."""
+    user_id: str
+    lane: str
+    priority: int
+    seq: int
+    enqueued_at: float = field(default_factory=time.monotonic)
+    started_at: Optional[float] = None
+    admitted: threading.Event = field(default_factory=threading.Event, repr=False)
+
+
+class PipelineScheduler:
+    """
+    Admission control in front of `run_pipeline`.
+
+    Enforces a global concurrency cap, a per-lane cap, and a per-user cap on
+    running pipelines. It also bounds how many requests may wait, overall and
+    per user. Waiting requests are ordered by (priority, number of pipelines
+    the user is already running, arrival), so lower priority values go first
+    and a user with nothing running is served before one who already has a
+    slot.
+
+    Queues are bounded by `max_queue`, so dispatch is a linear scan rather
+    than a heap: the ordering key depends on live per-user counts.
+
+    Args:
+        max_concurrent: Pipelines allowed to run at once across all users
+        max_per_user: Pipelines a single user may run at once
+        lane_limits: Per-lane concurrency caps, e.g. {"fast": 4, "large": 1}
+        max_queue: Requests allowed to wait per lane before new ones are rejected
+        max_queued_per_user: Requests a single user may have waiting at once
+
+    Raises:
+        ValueError: If any limit is below 1
+    """
+
+    def __init__(
+        self,
+        max_concurrent: int = 4,
+        max_per_user: int = 1,
+        lane_limits: Optional[Dict[str, int]] = None,
+        max_queue: int = 20,
+        max_queued_per_user: int = 2,
+    ):
+        self.max_concurrent = max_concurrent
+        self.max_per_user = max_per_user
+        self.lane_limits = {"fast": max_concurrent, "large": max(1, max_concurrent // 2)}
+        self.lane_limits.update(lane_limits or {})
+        self.max_queue = max_queue
+        self.max_queued_per_user = max_queued_per_user
+        limits = {
+            "max_concurrent": max_concurrent,
+            "max_per_user": max_per_user,
+            "max_queue": max_queue,
+            "max_queued_per_user": max_queued_per_user,
+            **{f"lane_limits[{lane!r}]": limit for lane, limit in self.lane_limits.items()},
+        }
+        for name, value in limits.items():
+            if value < 1:
+                raise ValueError(f"{name} must be at least 1, got {value}")
+
+        self._lock = threading.Lock()
+        self._seq = itertools.count()
+        self._queues: Dict[str, List[Ticket]] = {lane: [] for lane in self.lane_limits}
+        self._running: List[Ticket] = []
+        self._avg_seconds = {
+            lane: DEFAULT_RUN_SECONDS.get(lane, DEFAULT_RUN_SECONDS["fast"]) for lane in self.lane_limits
+        }
+
+    @classmethod
+    def from_env(cls) -> "PipelineScheduler":
+        """
+        Builds a scheduler from ATS_MAX_* environment variables.
+
+        Raises:
+            ValueError: If a variable is not an integer or is below 1
+        """
+        max_concurrent = int(os.getenv("ATS_MAX_CONCURRENT_PIPELINES", "4"))
+        return cls(
+            max_concurrent=max_concurrent,
+            max_per_user=int(os.getenv("ATS_MAX_PIPELINES_PER_USER", "1")),
+            lane_limits={
+                "fast": int(os.getenv("ATS_MAX_FAST_PIPELINES", str(max_concurrent))),
+                "large": int(os.getenv("ATS_MAX_LARGE_PIPELINES", str(max(1, max_concurrent // 2)))),
+            },
+            max_queue=int(os.getenv("ATS_MAX_QUEUE", "20")),
+            max_queued_per_user=int(os.getenv("ATS_MAX_QUEUED_PER_USER", "2")),
+        )
+
+    # --- Internal helpers (call with self._lock held) ---
+
+    def _user_running(self, user_id: str) -> int:
+        return sum(1 for t in self._running if t.user_id == user_id)
+
+    def _lane_running(self, lane: str) -> int:
+        return sum(1 for t in self._running if t.lane == lane)
+
+    def _order_key(self, ticket: Ticket):
+        return (ticket.priority, self._user_running(ticket.user_id), ticket.seq)
+
+    def _expected_wait(self, lane: str, position: int) -> float:
+        if position <= 0:
+            return 0.0
+        return math.ceil(position / self.lane_limits[lane]) * self._avg_seconds[lane]
+
+    def _dispatch(self):
+        while len(self._running) < self.max_concurrent:
+            best = None
+            for lane, queue in self._queues.items():
+                if self._lane_running(lane) >= self.lane_limits[lane]:
+                    continue
+                for ticket in queue:
+                    if self._user_running(ticket.user_id) >= self.max_per_user:
+                        continue
+                    if best is None or self._order_key(ticket) < self._order_key(best):
+                        best = ticket
+            if best is None:
+                return
+            self._queues[best.lane].remove(best)
+            best.started_at = time.monotonic()
+            self._running.append(best)
+            best.admitted.set()
+
+    # --- Public API ---
+
+    def submit(self, user_id: str, model_name: str, priority: int = 0) -> Ticket:
+        """
+        Queues a request for a pipeline slot and admits it immediately if capacity allows.
+
+        Raises:
+            SchedulerRejected: If the lane queue is full or the user already has
+                `max_queued_per_user` requests waiting
+        """
+        lane = lane_for_model(model_name)
+        with self._lock:
+            queue = self._queues[lane]
+            user_queued = sum(1 for q in self._queues.values() for t in q if t.user_id == user_id)
+            if user_queued >= self.max_queued_per_user:
+                raise SchedulerRejected(
+                    "You already have the maximum number of requests waiting.",
+                    len(queue), self._expected_wait(lane, len(queue) + 1),
+                )
+            if len(queue) >= self.max_queue:
+                raise SchedulerRejected(
+                    f"The {lane} queue is full.",
+                    len(queue), self._expected_wait(lane, len(queue) + 1),
+                )
+            ticket = Ticket(user_id=user_id, lane=lane, priority=priority, seq=next(self._seq))
+            queue.append(ticket)
+            self._dispatch()
+            return ticket
+
+    def status(self, ticket: Ticket) -> QueueStatus:
+        """Returns the ticket's current queue position and expected wait."""
+        with self._lock:
+            if ticket.admitted.is_set():
+                return QueueStatus(admitted=True, position=0, expected_wait_s=0.0)
+            key = self._order_key(ticket)
+            position = 1 + sum(1 for t in self._queues[ticket.lane] if self._order_key(t) < key)
+            return QueueStatus(False, position, self._expected_wait(ticket.lane, position))
+
+    def wait(self, ticket: Ticket, timeout: Optional[float] = None, poll_interval: float = 1.0,
+             on_update: Optional[Callable[[QueueStatus], None]] = None) -> bool:
+        """
+        Blocks until the ticket is admitted. Returns False on timeout.
+
+        `on_update` is called with the latest `QueueStatus` every `poll_interval`
+        seconds while waiting, e.g. to refresh a queue-position message in the UI.
+        """
+        deadline = None if timeout is None else time.monotonic() + timeout
+        while not ticket.admitted.is_set():
+            if on_update is not None:
+                on_update(self.status(ticket))
+            remaining = poll_interval if deadline is None else min(poll_interval, deadline - time.monotonic())
+            if remaining <= 0:
+                return False
+            ticket.admitted.wait(remaining)
+        return True
+
+    def release(self, ticket: Ticket):
+        """Frees the ticket's slot (or removes it from the queue) and admits the next requests."""
+        with self._lock:
+            if ticket in self._running:
+                self._running.remove(ticket)
+                elapsed = time.monotonic() - ticket.started_at
+                # EWMA so expected-wait estimates follow the current model latency
+                self._avg_seconds[ticket.lane] = 0.8 * self._avg_seconds[ticket.lane] + 0.2 * elapsed
+            elif ticket in self._queues[ticket.lane]:
+                self._queues[ticket.lane].remove(ticket)
+            self._dispatch()
+
+    def snapshot(self) -> Dict[str, Dict[str, float]]:
+        """Returns running and queued counts and the average run time per lane."""
+        with self._lock:
+            return {
+                lane: {
+                    "running": self._lane_running(lane),
+                    "queued": len(queue),
+                    "avg_run_s": round(self._avg_seconds[lane], 1),
+                }
+                for lane, queue in self._queues.items()
+            }
+
+    @contextmanager
+    def slot(self, user_id: str, model_name: str, priority: int = 0, timeout: Optional[float] = None,
+             on_update: Optional[Callable[[QueueStatus], None]] = None):
+        """
+        Context manager that waits for a pipeline slot and always releases it.
+
+        Raises:
+            SchedulerRejected: If the request is rejected outright
+            TimeoutError: If no slot frees up within `timeout` seconds
+        """
+        ticket = self.submit(user_id, model_name, priority)
+        try:
+            if not self.wait(ticket, timeout=timeout, on_update=on_update):
+                raise TimeoutError("Timed out waiting for a pipeline slot.")
+            yield ticket
+        finally:
+            self.release(ticket)
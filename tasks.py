@@ -1,4 +1,5 @@
 from crewai import Task
+from jd_analysis import format_keywords
 
 # This task is the first in the sequence, so it takes the raw text directly. No changes needed here.
 def parse_resume_task(agent, raw_resume_text):
@@ -16,13 +17,15 @@ def parse_resume_task(agent, raw_resume_text):
 
 # --- MODIFIED FUNCTION ---
 # It no longer takes `cleaned_resume_text`. It now takes `context` which will be the `t_parse` task.
-def rewrite_for_ats_task(agent, job_title, job_description, context):
+# `jd_keywords` is the compact list produced by `jd_analysis.extract_jd_keywords`, sent
+# instead of the full job description to keep the prompt small.
+def rewrite_for_ats_task(agent, job_title, jd_keywords, context):
     return Task(
         description=(
             f"Using the cleaned resume text from the previous step, rewrite it to be highly optimized "
             f"for an Applicant Tracking System (ATS) for the job title of '{job_title}'.\n\n"
-            f"Here is the target job description:\n--- START ---\n{job_description}\n--- END ---\n\n"
-            f"Your task is to strategically integrate relevant keywords from the job description, "
+            f"Target job keywords (most important first): {format_keywords(jd_keywords)}\n\n"
+            f"Your task is to strategically integrate the relevant target keywords, "
             f"use strong action verbs to start bullet points, and quantify achievements wherever possible. "
             f"The goal is a resume that would score above 80 points in an ATS."
         ),
@@ -49,22 +52,43 @@ def refine_bullets_task(agent, context):
         context=context
     )
 
-# --- MODIFIED FUNCTION ---
-# It no longer takes `final_resume_text`. It now takes `context` which will be the `t_refine` task.
-def evaluate_ats_task(agent, job_title, job_description, context):
+# Diff-based variant of `refine_bullets_task`. Instead of re-emitting the whole resume, the
+# refiner returns an edit list keyed by bullet ID, which `bullet_patch.apply_bullet_patch`
+# applies locally to the rewrite output. Only the bullets are sent, not the full resume.
+def refine_bullets_patch_task(agent, numbered_bullets):
+    return Task(
+        description=(
+            "Below are the bullet points from the 'Work Experience' section of an ATS-optimized resume, "
+            "each prefixed with its ID. Refine them into high-impact statements "
+            "using the STAR (Situation, Task, Action, Result) method where appropriate. "
+            "Ensure each refined bullet starts with a powerful action verb and includes quantifiable metrics "
+            "(e.g., percentages, dollar amounts, time saved) to demonstrate clear achievements.\n\n"
+            f"Bullet Points:\n--- START ---\n{numbered_bullets}\n--- END ---\n\n"
+            "Your output MUST be a single JSON object mapping bullet IDs to their replacement text, "
+            "for example {\"B1\": \"Led ...\", \"B4\": \"Reduced ...\"}. "
+            "Include only the bullets you changed, do not include the leading hyphen, "
+            "and do not add any text before or after the JSON."
+        ),
+        agent=agent,
+        expected_output="A single JSON object mapping changed bullet IDs to their refined text."
+    )
+
+# Patch-mode refinement (see `refine_bullets_patch_task`) assembles the final resume locally,
+# so the evaluator receives the final text directly instead of reading it from a task context.
+def evaluate_ats_task(agent, job_title, jd_keywords, final_resume_text):
     return Task(
         description=(
-            f"Evaluate the final, refined resume from the previous step against the job description "
+            f"Evaluate the following final resume against the target job keywords "
             f"for the role of '{job_title}'. Perform a detailed ATS-style analysis.\n\n"
-            f"Target Job Description:\n--- START ---\n{job_description}\n--- END ---\n\n"
+            f"Target job keywords (most important first): {format_keywords(jd_keywords)}\n\n"
+            f"Final Resume:\n--- START ---\n{final_resume_text}\n--- END ---\n\n"
             "Your output MUST be a single, clean JSON object. Do not add any text before or after the JSON. "
             "The JSON object must have the following keys:\n"
             "1. 'overall_score': An integer from 0 to 100.\n"
             "2. 'score_breakdown': A JSON object with integer scores (1-5) for 'keyword_match', 'structure', 'metrics_quantification', and 'action_verbs'.\n"
-            "3. 'missing_keywords': A list of 5-10 important keywords from the job description that are missing from the resume.\n"
+            "3. 'missing_keywords': A list of 5-10 important target keywords that are missing from the resume.\n"
             "4. 'quick_wins': A list of 2-3 specific, actionable recommendations for immediate improvement."
         ),
         agent=agent,
-        expected_output="A single JSON object with the complete ATS evaluation, including score, breakdown, and recommendations.",
-        context=context
+        expected_output="A single JSON object with the complete ATS evaluation, including score, breakdown, and recommendations."
     )
\ No newline at end of file
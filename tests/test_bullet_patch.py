@@ -0,0 +1,82 @@
+import pytest
+import sys
+import os
+
+# Add the project root to the Python path
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+
+from bullet_patch import (
+    BulletPatchError,
+    apply_bullet_patch,
+    format_bullets_for_prompt,
+    index_bullets,
+    parse_bullet_patch
+)
+
+RESUME = """JANE DOE
+WORK EXPERIENCE
+Acme Corp - Engineer
+- Built internal tools
+  * Maintained CI pipeline
+SKILLS
+• Python, SQL"""
+
+
+def test_index_bullets_assigns_sequential_ids():
+    bullets = index_bullets(RESUME)
+    assert [b[0] for b in bullets] == ["B1", "B2"]
+    assert bullets[0] == ("B1", 3, "Built internal tools")
+    assert format_bullets_for_prompt(bullets).splitlines()[1] == "B2: Maintained CI pipeline"
+
+
+def test_apply_bullet_patch_replaces_only_referenced_bullets():
+    patched = apply_bullet_patch(RESUME, {"B2": "- Cut CI time by 40% by caching builds"})
+    lines = patched.splitlines()
+    assert lines[4] == "  * Cut CI time by 40% by caching builds"
+    assert lines[:4] == RESUME.splitlines()[:4]
+    assert lines[5:] == RESUME.splitlines()[5:]
+
+
+def test_index_bullets_offers_only_work_experience_bullets():
+    resume = (
+        "JANE DOE\n## Professional Summary\n- Data engineer with 8 years of experience\n"
+        "**Work Experience**\nACME CORP - SENIOR ENGINEER\n- Built internal tools\n"
+        "Globex - Engineer\n- Migrated reports to Snowflake\n"
+        "Skills:\n- Python, SQL, Spark\nEDUCATION\n- B.Sc. Computer Science"
+    )
+    prompt = format_bullets_for_prompt(index_bullets(resume))
+    assert prompt == "B1: Built internal tools\nB2: Migrated reports to Snowflake"
+    assert "Python, SQL, Spark" not in prompt
+    with pytest.raises(BulletPatchError):
+        apply_bullet_patch(RESUME, {"B3": "Python, SQL, Spark, Kafka"})
+
+
+def test_index_bullets_does_not_end_experience_at_job_titles():
+    resume = (
+        "JANE DOE\nPROFESSIONAL EXPERIENCE\nContact Center Manager\n- Cut call wait times by 30%\n"
+        "Acme Corp - Engineer\n- Built internal tools\nGlobex - Training Lead\n- Trained 40 new hires\n"
+        "PROJECT MANAGER, INITECH\n- Shipped a billing migration\nSKILLS\n- Python, SQL"
+    )
+    prompt = format_bullets_for_prompt(index_bullets(resume))
+    assert prompt.splitlines() == [
+        "B1: Cut call wait times by 30%",
+        "B2: Built internal tools",
+        "B3: Trained 40 new hires",
+        "B4: Shipped a billing migration",
+    ]
+
+
+def test_apply_bullet_patch_rejects_unknown_ids():
+    with pytest.raises(BulletPatchError):
+        apply_bullet_patch(RESUME, {"B9": "Nope"})
+
+
+def test_parse_bullet_patch_tolerates_code_fences():
+    raw = 'Here you go:\n```json\n{"B1": "Built 5 tools used by 200 engineers"}\n```'
+    assert parse_bullet_patch(raw) == {"B1": "Built 5 tools used by 200 engineers"}
+
+
+@pytest.mark.parametrize("raw", ["no json here", "{not valid}", '["B1"]', '{"B1": ""}'])
+def test_parse_bullet_patch_rejects_malformed_output(raw):
+    with pytest.raises(BulletPatchError):
+        parse_bullet_patch(raw)
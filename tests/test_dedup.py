@@ -0,0 +1,100 @@
+import pytest
+import sys
+import os
+
+# Add the project root to the Python path
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+
+from dedup import NearDuplicateIndex, contact_fingerprint, estimate_similarity, job_key, match_key, minhash_signature
+
+RESUME = """JANE DOE
+Senior Data Engineer | jane@example.com
+WORK EXPERIENCE
+Acme Corp - Senior Data Engineer (2019 - Present)
+- Reduced nightly ETL runtime by 45% by migrating 120 jobs from Hive to Spark
+- Led a team of 4 engineers delivering a real-time fraud pipeline processing 2M events per day
+- Cut AWS spend by 180K per year through storage tiering and right-sizing EMR clusters
+Globex - Data Engineer (2016 - 2019)
+- Built CI/CD for 60 Airflow DAGs, lowering failed deploys by 70%
+- Designed dimensional models powering 35 executive dashboards
+- Mentored 3 junior engineers and ran weekly data quality reviews
+- Migrated reporting warehouse from Oracle to Snowflake with zero downtime
+SKILLS
+Python, SQL, Spark, Airflow, Kafka, AWS, Docker, Kubernetes, Terraform
+EDUCATION
+B.Sc. Computer Science, State University, 2016
+"""
+
+# Same resume re-extracted from a different file format with one small edit
+RESUME_EDITED = RESUME.replace("- ", "• ").replace("35 executive", "40 executive")
+
+OTHER_RESUME = """JOHN SMITH
+Marketing Manager | john@example.com
+EXPERIENCE
+Initech - Marketing Manager
+- Grew newsletter subscribers from 10K to 85K in two years
+- Managed a 1.2M annual budget across paid search and social campaigns
+SKILLS
+SEO, Google Analytics, HubSpot, copywriting
+"""
+
+# Someone else's resume: identical apart from the name and email
+RESUME_OTHER_PERSON = RESUME.replace("JANE DOE", "MARY MAJOR").replace("jane@example.com", "mary@example.com")
+
+KEY = job_key("Data Engineer", "Build data pipelines.", "llama-3.1-8b-instant")
+
+
+def test_signature_is_deterministic_and_ignores_formatting():
+    assert minhash_signature(RESUME) == minhash_signature(RESUME)
+    assert minhash_signature(RESUME) == minhash_signature(RESUME.replace("- ", "* ").upper())
+
+
+def test_similarity_separates_edits_from_different_resumes():
+    base = minhash_signature(RESUME)
+    assert estimate_similarity(base, minhash_signature(RESUME_EDITED)) > 0.85
+    assert estimate_similarity(base, minhash_signature(OTHER_RESUME)) < 0.2
+
+
+def test_index_finds_near_duplicate_for_same_job_only():
+    index = NearDuplicateIndex()
+    index.add("run-1", RESUME, KEY, "cached result")
+
+    match = index.find(RESUME_EDITED, KEY)
+    assert match is not None
+    assert match.run_id == "run-1"
+    assert match.result == "cached result"
+
+    assert index.find(OTHER_RESUME, KEY) is None
+    other_job = job_key("Data Engineer", "Build data pipelines.", "llama-3.3-70b-versatile")
+    assert index.find(RESUME_EDITED, other_job) is None
+
+
+def test_index_evicts_beyond_capacity():
+    index = NearDuplicateIndex(capacity=1)
+    index.add("run-1", RESUME, KEY, 1)
+    index.add("run-2", OTHER_RESUME, KEY, 2)
+    assert len(index) == 1
+    assert index.find(RESUME, KEY) is None
+    assert index.find(OTHER_RESUME, KEY).run_id == "run-2"
+
+
+def test_index_rejects_invalid_threshold():
+    with pytest.raises(ValueError):
+        NearDuplicateIndex(threshold=0)
+
+
+def test_match_key_separates_people_with_near_identical_resumes():
+    assert estimate_similarity(minhash_signature(RESUME), minhash_signature(RESUME_OTHER_PERSON)) > 0.85
+    args = ("Data Engineer", "Build data pipelines.", "llama-3.1-8b-instant")
+    assert match_key(*args, RESUME) == match_key(*args, RESUME_EDITED)
+    assert match_key(*args, RESUME) != match_key(*args, RESUME_OTHER_PERSON)
+
+    index = NearDuplicateIndex()
+    index.add("run-1", RESUME, match_key(*args, RESUME), "jane's result")
+    assert index.find(RESUME_EDITED, match_key(*args, RESUME_EDITED)).run_id == "run-1"
+    assert index.find(RESUME_OTHER_PERSON, match_key(*args, RESUME_OTHER_PERSON)) is None
+
+
+def test_contact_fingerprint_ignores_dates():
+    resume = "JANE DOE\n+1 (555) 123-4567 | jane@example.com\nAcme (2019 - 2020)"
+    assert contact_fingerprint(resume) == "jane doe\njane@example.com\n15551234567"
@@ -0,0 +1,84 @@
+import pytest
+from docx import Document
+from io import BytesIO
+import sys
+import os
+
+# Add the project root to the Python path
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+
+from file_tools.docx_writer import classify_line, docx_bytes, export_batch, write_docx
+
+RESUME = "## Jane Doe\nWORK EXPERIENCE\n- Cut costs by 30% <AWS & GCP>\nSkills:\nPython developer.\n\n* **Led** a team of 4"
+
+
+class _NonSeekableStream:
+    """Write-only stream mimicking a socket or HTTP response body."""
+
+    def __init__(self):
+        self.buffer = BytesIO()
+
+    def write(self, data):
+        return self.buffer.write(data)
+
+    def flush(self):
+        pass
+
+
+@pytest.mark.parametrize("line,expected", [
+    ("", ("blank", "")),
+    ("- Built tools", ("bullet", "Built tools")),
+    ("• **Led** migration", ("bullet", "Led migration")),
+    ("### Projects", ("heading", "Projects")),
+    ("EDUCATION", ("heading", "EDUCATION")),
+    ("Skills:", ("heading", "Skills")),
+    ("**Work Experience**", ("heading", "Work Experience")),
+    ("**Professional Summary**:", ("heading", "Professional Summary")),
+    ("**Acme Corp** - Senior Engineer", ("body", "Acme Corp - Senior Engineer")),
+    ("C++", ("body", "C++")),
+    ("SQL, AWS, GCP", ("body", "SQL, AWS, GCP")),
+    ("Engineer with 5 years of experience.", ("body", "Engineer with 5 years of experience.")),
+])
+def test_classify_line(line, expected):
+    assert classify_line(line) == expected
+
+
+def test_write_docx_maps_lines_to_styles():
+    doc = Document(BytesIO(docx_bytes(RESUME)))
+    styled = [(p.style.name, p.text) for p in doc.paragraphs]
+    assert styled == [
+        ("Heading 1", "Jane Doe"),
+        ("Heading 1", "WORK EXPERIENCE"),
+        ("List Bullet", "Cut costs by 30% <AWS & GCP>"),
+        ("Heading 1", "Skills"),
+        ("Normal", "Python developer."),
+        ("Normal", ""),
+        ("List Bullet", "Led a team of 4"),
+    ]
+
+
+def test_write_docx_supports_non_seekable_streams():
+    stream = _NonSeekableStream()
+    write_docx(RESUME, stream)
+    doc = Document(BytesIO(stream.buffer.getvalue()))
+    assert doc.paragraphs[0].text == "Jane Doe"
+
+
+def test_export_batch_writes_one_file_per_document(tmp_path):
+    paths = export_batch([("a", RESUME), ("b", "Hello")], str(tmp_path), max_workers=2)
+    assert paths == [str(tmp_path / "a.docx"), str(tmp_path / "b.docx")]
+    assert Document(paths[1]).paragraphs[0].text == "Hello"
+
+
+def test_export_batch_keeps_files_inside_out_dir(tmp_path):
+    out_dir = tmp_path / "out"
+    paths = export_batch([("../escape", "Hello"), ("a/b:c", "World")], str(out_dir), max_workers=1)
+    assert paths == [str(out_dir / "escape.docx"), str(out_dir / "b_c.docx")]
+    assert not (tmp_path / "escape.docx").exists()
+
+
+@pytest.mark.parametrize("names", [["a", "a"], ["Resume", "resume"], ["..", "b"]])
+def test_export_batch_rejects_duplicate_or_empty_names(tmp_path, names):
+    with pytest.raises(ValueError):
+        export_batch([(name, "Hello") for name in names], str(tmp_path), max_workers=1)
+    assert list(tmp_path.iterdir()) == []
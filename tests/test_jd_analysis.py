@@ -0,0 +1,113 @@
+import pytest
+import sys
+import os
+
+# Add the project root to the Python path
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+
+from jd_analysis import extract_jd_keywords, format_keywords, normalize_job_description
+
+JOB_DESCRIPTION = """
+We are looking for a Data Engineer to build and maintain data pipelines.
+• Strong Python and SQL skills
+• Experience with Apache Spark and AWS
+• You will own data pipelines end to end, including CI/CD and Docker.
+"""
+
+
+def test_normalize_job_description_strips_bullets_and_whitespace():
+    normalized = normalize_job_description(JOB_DESCRIPTION)
+    assert "•" not in normalized
+    assert "\n" not in normalized
+    assert "  " not in normalized
+
+
+# A full-length posting whose company blurb repeats generic words more often
+# than the requirements mention any single skill.
+FULL_JOB_DESCRIPTION = """
+About Contoso
+Contoso helps millions of customers manage their finances every day. Join a team that owns the platform end to end and a culture that values ownership, curiosity and kindness. Our customers trust us with their money, and we help millions of families manage budgets, pay bills and plan for the future.
+
+What you'll do
+- Design, build and operate backend services that help customers manage their finances
+- Own services end to end, from design reviews to on-call
+- Partner with product and design to ship features customers love every day
+- Mentor engineers and help grow our engineering culture
+
+What we're looking for
+- 6+ years of backend development experience in Kotlin or Java
+- Strong experience with PostgreSQL and Redis
+- Experience building event-driven systems with Kafka
+- Designing REST and gRPC APIs
+- Running services on Kubernetes in AWS
+- Infrastructure as code with Terraform
+- Familiarity with PCI DSS compliance
+
+Nice to have
+- Experience with Datadog and OpenTelemetry
+- Fintech or payments background
+
+Why join Contoso
+Join us to help millions of customers every day. We offer competitive pay, flexible hours and a culture where you can do your best work.
+"""
+
+
+def test_extract_jd_keywords_ranks_title_and_skills_first():
+    keywords = extract_jd_keywords("Data Engineer", JOB_DESCRIPTION)
+    assert keywords[:2] == ["data", "engineer"]
+    assert "data pipelines" in keywords
+    assert keywords.index("python") < keywords.index("maintain")
+    for expected in ["python", "sql", "spark", "aws", "ci/cd", "docker"]:
+        assert expected in keywords
+    for stopword in ["we", "and", "with", "experience", "strong"]:
+        assert stopword not in keywords
+
+
+def test_extract_jd_keywords_respects_limit_and_has_no_duplicates():
+    keywords = extract_jd_keywords("Data Engineer", JOB_DESCRIPTION, max_keywords=5)
+    assert len(keywords) == 5
+    assert len(set(keywords)) == len(keywords)
+
+
+def test_format_keywords_handles_empty_list():
+    assert format_keywords([]) == "(no keywords extracted)"
+    assert format_keywords(["python", "sql"]) == "python, sql"
+
+
+def test_extract_jd_keywords_keeps_skills_mentioned_once_in_a_full_posting():
+    keywords = extract_jd_keywords("Senior Backend Engineer", FULL_JOB_DESCRIPTION)
+    assert keywords[:3] == ["senior", "backend", "engineer"]
+    for skill in ["postgresql", "kafka", "redis", "kubernetes", "terraform", "aws", "grpc", "rest", "kotlin", "pci dss"]:
+        assert skill in keywords
+    # Every hard skill outranks every word from the company blurb that made the list
+    last_skill = max(keywords.index(skill) for skill in ["postgresql", "kafka", "terraform", "pci dss"])
+    blurb = [k for k in keywords if k in {"millions", "customers", "help", "manage", "finances", "join", "end"}]
+    assert blurb and all(keywords.index(word) > last_skill for word in blurb)
+
+
+@pytest.mark.parametrize("title,description,expected", [
+    (
+        "Product Manager",
+        "What you'll do\n- Own the product roadmap for our mobile app\n"
+        "- Run product management rituals with design and engineering\n"
+        "Requirements\n- 4+ years of product management experience\n- Experience with Jira and Amplitude",
+        ["product", "manager", "product management", "jira", "amplitude"],
+    ),
+    (
+        "UX Designer",
+        "What you'll do\n- Design end-to-end checkout flows\n- Contribute to UX design reviews and our design systems\n"
+        "What we're looking for\n- A portfolio showing UX design work\n- Experience maintaining design systems in Figma",
+        ["ux", "designer", "ux design", "design systems", "design", "figma"],
+    ),
+    (
+        "Customer Success Manager",
+        "Responsibilities\n- Manage a book of 40 enterprise customers\n- Lead onboarding and customer success reviews\n"
+        "Requirements\n- 3+ years in customer success or account management\n- Experience with Salesforce and Gainsight",
+        ["customer", "success", "manager", "customer success", "customers", "salesforce", "gainsight"],
+    ),
+])
+def test_extract_jd_keywords_keeps_domain_terms_of_the_role(title, description, expected):
+    keywords = extract_jd_keywords(title, description)
+    assert keywords[:len(title.split())] == title.lower().split()
+    for term in expected:
+        assert term in keywords
@@ -0,0 +1,139 @@
+import threading
+import time
+import pytest
+import sys
+import os
+
+# Add the project root to the Python path
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+
+from scheduler import PipelineScheduler, SchedulerRejected, lane_for_model, user_key
+
+FAST = "llama-3.1-8b-instant"
+LARGE = "llama-3.3-70b-versatile"
+
+
+def test_lane_for_model():
+    assert lane_for_model(FAST) == "fast"
+    assert lane_for_model(LARGE) == "large"
+    assert lane_for_model("some-new-model") == "fast"
+
+
+def test_global_cap_queues_excess_requests():
+    scheduler = PipelineScheduler(max_concurrent=2, max_per_user=5)
+    tickets = [scheduler.submit(f"user-{i}", FAST) for i in range(3)]
+    assert [t.admitted.is_set() for t in tickets] == [True, True, False]
+
+    status = scheduler.status(tickets[2])
+    assert status.position == 1
+    assert status.expected_wait_s > 0
+
+    scheduler.release(tickets[0])
+    assert tickets[2].admitted.is_set()
+    assert scheduler.status(tickets[2]).admitted is True
+
+
+def test_per_user_cap_lets_other_users_go_first():
+    scheduler = PipelineScheduler(max_concurrent=2, max_per_user=1)
+    first = scheduler.submit("heavy", FAST)
+    second = scheduler.submit("heavy", FAST)
+    other = scheduler.submit("light", FAST)
+    assert first.admitted.is_set()
+    assert not second.admitted.is_set()
+    assert other.admitted.is_set()
+
+
+def test_large_lane_cannot_starve_fast_lane():
+    scheduler = PipelineScheduler(max_concurrent=3, max_per_user=5, lane_limits={"large": 1})
+    large = [scheduler.submit(f"user-{i}", LARGE) for i in range(3)]
+    fast = scheduler.submit("user-fast", FAST)
+    assert [t.admitted.is_set() for t in large] == [True, False, False]
+    assert fast.admitted.is_set()
+
+
+def test_priority_orders_waiting_requests():
+    scheduler = PipelineScheduler(max_concurrent=1, max_per_user=5, max_queued_per_user=5)
+    running = scheduler.submit("a", FAST)
+    low = scheduler.submit("b", FAST, priority=5)
+    high = scheduler.submit("c", FAST, priority=0)
+    assert scheduler.status(high).position == 1
+    assert scheduler.status(low).position == 2
+    scheduler.release(running)
+    assert high.admitted.is_set() and not low.admitted.is_set()
+
+
+def test_rejects_when_queue_or_user_quota_is_full():
+    scheduler = PipelineScheduler(max_concurrent=1, max_queue=2, max_queued_per_user=1)
+    scheduler.submit("a", FAST)
+    scheduler.submit("b", FAST)
+    with pytest.raises(SchedulerRejected):
+        scheduler.submit("b", FAST)
+    scheduler.submit("c", FAST)
+    with pytest.raises(SchedulerRejected) as excinfo:
+        scheduler.submit("d", FAST)
+    assert excinfo.value.queue_length == 2
+    assert excinfo.value.expected_wait_s > 0
+
+
+def test_slot_waits_reports_position_and_releases():
+    scheduler = PipelineScheduler(max_concurrent=1)
+    blocker = scheduler.submit("a", FAST)
+    updates = []
+    entered = threading.Event()
+
+    def worker():
+        with scheduler.slot("b", FAST, on_update=updates.append):
+            entered.set()
+
+    thread = threading.Thread(target=worker)
+    thread.start()
+    deadline = time.monotonic() + 5
+    while not updates and time.monotonic() < deadline:
+        time.sleep(0.01)
+    assert updates[0].position == 1
+    scheduler.release(blocker)
+    thread.join(5)
+    assert entered.is_set()
+    assert scheduler.snapshot()["fast"]["running"] == 0
+
+
+def test_slot_times_out_and_leaves_queue():
+    scheduler = PipelineScheduler(max_concurrent=1)
+    scheduler.submit("a", FAST)
+    with pytest.raises(TimeoutError):
+        with scheduler.slot("b", FAST, timeout=0.05):
+            pass
+    assert scheduler.snapshot()["fast"]["queued"] == 0
+
+
+@pytest.mark.parametrize("kwargs", [
+    {"max_concurrent": 0},
+    {"max_per_user": 0},
+    {"max_queue": 0},
+    {"lane_limits": {"large": 0}},
+])
+def test_rejects_limits_below_one(kwargs):
+    with pytest.raises(ValueError):
+        PipelineScheduler(**kwargs)
+
+
+def test_from_env_rejects_zero_lane_limit(monkeypatch):
+    monkeypatch.setenv("ATS_MAX_LARGE_PIPELINES", "0")
+    with pytest.raises(ValueError, match="large"):
+        PipelineScheduler.from_env()
+
+
+def test_user_key_ignores_spoofed_forwarded_for_by_default(monkeypatch):
+    monkeypatch.delenv("ATS_TRUST_PROXY_HEADERS", raising=False)
+    assert user_key(None, "203.0.113.7") == "ip:203.0.113.7"
+    assert user_key(None, "203.0.113.7", "198.51.100.1") == "ip:203.0.113.7"
+    assert user_key(None, "203.0.113.7", "10.0.0.99, 198.51.100.1") == "ip:203.0.113.7"
+    assert user_key("jane@example.com", "203.0.113.7", "198.51.100.1") == "account:jane@example.com"
+    assert user_key(None, None, "198.51.100.1") is None
+
+
+def test_user_key_uses_hop_added_by_trusted_proxy(monkeypatch):
+    monkeypatch.setenv("ATS_TRUST_PROXY_HEADERS", "true")
+    # The client sent "10.0.0.99" itself; the proxy appended the real address
+    assert user_key(None, "172.17.0.1", "10.0.0.99, 203.0.113.7") == "ip:203.0.113.7"
+    assert user_key(None, "172.17.0.1", None) == "ip:172.17.0.1"
@@ -0,0 +1,122 @@
+import json
+import threading
+import pytest
+import sys
+import os
+
+# Add the project root to the Python path
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+
+import tracing
+from tracing import BackgroundExporter, FileSink, get_trace_buffer_size, get_trace_sample_rate, sampled_run, should_sample, span
+
+
+class _BlockingSink:
+    """Sink that holds the exporter thread until released, to fill the buffer."""
+
+    def __init__(self):
+        self.release = threading.Event()
+        self.records = []
+
+    def write(self, records):
+        self.release.wait(5)
+        self.records.extend(records)
+
+
+@pytest.mark.parametrize("value,expected", [("0.25", 0.25), ("5", 1.0), ("-1", 0.0), ("abc", 1.0)])
+def test_get_trace_sample_rate_parses_and_clamps(monkeypatch, value, expected):
+    monkeypatch.setenv("ATS_TRACE_SAMPLE_RATE", value)
+    assert get_trace_sample_rate() == expected
+
+
+@pytest.mark.parametrize("value,expected", [("50", 50), ("0", 1), ("1k", 1000), ("", 1000)])
+def test_get_trace_buffer_size_parses_and_clamps(monkeypatch, value, expected):
+    monkeypatch.setenv("ATS_TRACE_BUFFER", value)
+    assert get_trace_buffer_size() == expected
+
+
+def test_should_sample_edges():
+    assert should_sample(1.0) is True
+    assert should_sample(0.0) is False
+    hits = sum(should_sample(0.3) for _ in range(2000))
+    assert 450 < hits < 750
+
+
+def test_background_exporter_writes_to_file_sink(tmp_path):
+    path = tmp_path / "traces.jsonl"
+    exporter = BackgroundExporter(FileSink(str(path)))
+    for i in range(5):
+        assert exporter.submit({"name": f"span-{i}"})
+    exporter.close()
+    lines = [json.loads(line) for line in path.read_text().splitlines()]
+    assert [r["name"] for r in lines] == [f"span-{i}" for i in range(5)]
+    assert exporter.exported == 5
+
+
+def test_background_exporter_drops_when_buffer_full():
+    sink = _BlockingSink()
+    exporter = BackgroundExporter(sink, max_buffer=2, batch_size=1)
+    results = [exporter.submit({"n": i}) for i in range(10)]
+    assert results.count(False) == exporter.dropped
+    assert exporter.dropped >= 7
+    sink.release.set()
+    exporter.close()
+    assert len(sink.records) == 10 - exporter.dropped
+
+
+def test_background_exporter_counts_drops_from_concurrent_callers():
+    sink = _BlockingSink()
+    exporter = BackgroundExporter(sink, max_buffer=1, batch_size=1)
+    rejected = []
+
+    def submit_many():
+        failures = sum(not exporter.submit({}) for _ in range(2000))
+        rejected.append(failures)
+
+    threads = [threading.Thread(target=submit_many) for _ in range(8)]
+    for t in threads:
+        t.start()
+    for t in threads:
+        t.join()
+    assert exporter.dropped == sum(rejected)
+    sink.release.set()
+    exporter.close()
+    assert exporter.exported + exporter.dropped == 8 * 2000
+
+
+def test_span_records_only_sampled_runs(tmp_path, monkeypatch):
+    path = tmp_path / "traces.jsonl"
+    monkeypatch.setenv("ATS_TRACE_SINK", "file")
+    monkeypatch.setenv("ATS_TRACE_FILE", str(path))
+    monkeypatch.setattr(tracing, "_exporter", None)
+
+    with sampled_run(False):
+        with span("skipped"):
+            pass
+    assert tracing._exporter is None
+
+    with sampled_run(True):
+        with span("parse", model="m"):
+            pass
+        with pytest.raises(RuntimeError):
+            with span("rewrite"):
+                raise RuntimeError("boom")
+    tracing._exporter.close()
+
+    records = [json.loads(line) for line in path.read_text().splitlines()]
+    assert [r["name"] for r in records] == ["parse", "rewrite"]
+    assert records[0]["metadata"] == {"model": "m"}
+    assert "boom" in records[1]["error"]
+
+
+def test_span_survives_invalid_buffer_setting(tmp_path, monkeypatch):
+    monkeypatch.setenv("ATS_TRACE_SINK", "file")
+    monkeypatch.setenv("ATS_TRACE_FILE", str(tmp_path / "traces.jsonl"))
+    monkeypatch.setenv("ATS_TRACE_BUFFER", "1k")
+    monkeypatch.setattr(tracing, "_exporter", None)
+
+    with sampled_run(True):
+        with span("pipeline"):
+            pass
+    assert tracing._exporter._queue.maxsize == 1000
+    tracing._exporter.close()
@@ -0,0 +1,216 @@
+import atexit
+import json
+import os
+import queue
+import random
+import threading
+import time
+from contextlib import contextmanager
+from contextvars import ContextVar
+from typing import Any, Dict, List, Optional
+
+# Tracing is controlled through environment variables, like the rest of the config:
+#   ATS_TRACE_SINK         "langsmith" (default), "file" or "off"
+#   ATS_TRACE_SAMPLE_RATE  Fraction of pipeline runs that are traced, 0.0-1.0 (default 1.0)
+#   ATS_TRACE_FILE         JSONL output for the "file" sink (default "traces.jsonl")
+#   ATS_TRACE_BUFFER       Max spans held in memory before new ones are dropped (default 1000, minimum 1)
+#   ATS_QUIET              "true" turns off agent/crew verbosity and pipeline banners
+TRACE_SINKS = ("langsmith", "file", "off")
+
+_TRUTHY = ("1", "true", "yes", "on")
+
+# Whether the current pipeline run was selected by sampling. Stored per context
+# so concurrent Streamlit sessions do not overwrite each other's decision.
+_run_sampled: ContextVar[bool] = ContextVar("ats_trace_run_sampled", default=False)
+
+
+def is_quiet() -> bool:
+    """Returns True when ATS_QUIET is set, disabling agent verbosity and console banners."""
+    return os.getenv("ATS_QUIET", "").strip().lower() in _TRUTHY
+
+
+def get_trace_sink() -> str:
+    """Returns the configured trace sink, falling back to "langsmith" for unknown values."""
+    sink = os.getenv("ATS_TRACE_SINK", "langsmith").strip().lower()
+    return sink if sink in TRACE_SINKS else "langsmith"
+
+
+def get_trace_sample_rate() -> float:
+    """Returns ATS_TRACE_SAMPLE_RATE clamped to [0, 1]; invalid values mean 1.0."""
+    try:
+        rate = float(os.getenv("ATS_TRACE_SAMPLE_RATE", "1.0"))
+    except ValueError:
+        return 1.0
+    return min(max(rate, 0.0), 1.0)
+
+
+def get_trace_buffer_size() -> int:
+    """Returns ATS_TRACE_BUFFER as an int of at least 1; invalid values mean 1000."""
+    try:
+        size = int(os.getenv("ATS_TRACE_BUFFER", "1000"))
+    except ValueError:
+        return 1000
+    return max(size, 1)
+
+
+def should_sample(rate: Optional[float] = None) -> bool:
+    """Makes the per-run sampling decision."""
+    rate = get_trace_sample_rate() if rate is None else rate
+    return rate >= 1.0 or (rate > 0.0 and random.random() < rate)
+
+
+class FileSink:
+    """Appends spans as JSON lines to a local file, as an offline stand-in for LangSmith."""
+
+    def __init__(self, path: str):
+        self.path = path
+
+    def write(self, records: List[Dict[str, Any]]) -> None:
+        with open(self.path, "a", encoding="utf-8") as f:
+            for record in records:
+                f.write(json.dumps(record, default=str) + "\n")
+
+
+class BackgroundExporter:
+    """
+    Ships span records to a sink from a daemon thread.
+
+    `submit` never blocks the pipeline: records go into a bounded queue and are
+    dropped (and counted in `dropped`) when the queue is full. The worker drains
+    the queue in batches of up to `batch_size`. The counters are updated from
+    both caller threads and the worker, so they are guarded by a lock.
+
+    Args:
+        sink: Object with a `write(records)` method
+        max_buffer: Maximum number of records waiting to be exported
+        batch_size: Maximum number of records per `sink.write` call
+    """
+
+    def __init__(self, sink, max_buffer: int = 1000, batch_size: int = 100):
+        self.sink = sink
+        self.batch_size = batch_size
+        self.dropped = 0
+        self.exported = 0
+        self._counter_lock = threading.Lock()
+        self._queue: "queue.Queue[Optional[Dict[str, Any]]]" = queue.Queue(maxsize=max_buffer)
+        self._thread = threading.Thread(target=self._run, name="trace-exporter", daemon=True)
+        self._thread.start()
+
+    def submit(self, record: Dict[str, Any]) -> bool:
+        """Queues a record for export. Returns False if the buffer was full and it was dropped."""
+        try:
+            self._queue.put_nowait(record)
+            return True
+        except queue.Full:
+            with self._counter_lock:
+                self.dropped += 1
+            return False
+
+    def flush(self, timeout: float = 5.0) -> bool:
+        """Waits until all queued records are written. Returns False on timeout."""
+        deadline = time.monotonic() + timeout
+        while self._queue.unfinished_tasks:
+            if time.monotonic() > deadline:
+                return False
+            time.sleep(0.01)
+        return True
+
+    def close(self, timeout: float = 5.0) -> None:
+        """Flushes pending records and stops the worker thread."""
+        self.flush(timeout)
+        try:
+            self._queue.put(None, timeout=timeout)
+        except queue.Full:
+            return
+        self._thread.join(timeout)
+
+    def _run(self):
+        stopping = False
+        while not stopping:
+            record = self._queue.get()
+            if record is None:
+                self._queue.task_done()
+                return
+            batch = [record]
+            while len(batch) < self.batch_size:
+                try:
+                    extra = self._queue.get_nowait()
+                except queue.Empty:
+                    break
+                if extra is None:
+                    # Stop after writing this batch
+                    self._queue.task_done()
+                    stopping = True
+                    break
+                batch.append(extra)
+            try:
+                self.sink.write(batch)
+                with self._counter_lock:
+                    self.exported += len(batch)
+            except Exception as e:
+                # Exporting must never take the pipeline down
+                with self._counter_lock:
+                    self.dropped += len(batch)
+                print(f"WARNING: Trace export failed: {e}")
+            finally:
+                for _ in batch:
+                    self._queue.task_done()
+
+
+_exporter: Optional[BackgroundExporter] = None
+_exporter_lock = threading.Lock()
+
+
+def get_exporter() -> Optional[BackgroundExporter]:
+    """
+    Returns the process-wide exporter for the "file" sink, creating it on first use.
+    Returns None for the other sinks, which do not go through this exporter.
+    """
+    global _exporter
+    if get_trace_sink() != "file":
+        return None
+    with _exporter_lock:
+        if _exporter is None:
+            sink = FileSink(os.getenv("ATS_TRACE_FILE", "traces.jsonl"))
+            _exporter = BackgroundExporter(sink, max_buffer=get_trace_buffer_size())
+            atexit.register(_exporter.close)
+        return _exporter
+
+
+@contextmanager
+def sampled_run(sampled: bool):
+    """Marks the current context (one pipeline run) as sampled or not for `span`."""
+    token = _run_sampled.set(sampled)
+    try:
+        yield
+    finally:
+        _run_sampled.reset(token)
+
+
+@contextmanager
+def span(name: str, **metadata):
+    """
+    Records the duration of a pipeline stage to the background exporter.
+
+    A no-op unless the file sink is configured and the current run was sampled,
+    so unsampled runs pay only for a context-variable lookup.
+    """
+    exporter = get_exporter() if _run_sampled.get() else None
+    if exporter is None:
+        yield
+        return
+    start = time.time()
+    error = None
+    try:
+        yield
+    except Exception as e:
+        error = repr(e)
+        raise
+    finally:
+        exporter.submit({
+            "name": name,
+            "start_time": start,
+            "duration_s": round(time.time() - start, 6),
+            "error": error,
+            "metadata": metadata,
+        })